@@ -13,6 +13,8 @@ This script automates the entire workflow for generating product reviews:
 Requirements:
 - Python 3.8+
 - requests, beautifulsoup4, openai
+- brotli (optional, for precompressed .br output)
+- numpy (optional, for related product cross-linking)
 - MCP tools configured (Tavily, BrightData, etc.)
 
 Usage:
@@ -23,37 +25,1350 @@ Usage:
 import json
 import os
 import sys
+import asyncio
+import copy
+import gzip
+import hashlib
+import heapq
+import itertools
+import math
+import re
+import ssl
+import tempfile
+import threading
+import time
+import unicodedata
+import zlib
 import requests
+from concurrent.futures import ThreadPoolExecutor, Future
 from datetime import datetime
-from typing import List, Dict, Any
+from html import escape as html_escape, unescape as html_unescape
+from html.parser import HTMLParser
+from typing import List, Dict, Any, Optional, Set
+from urllib.parse import unquote, urljoin, urlsplit
+from xml.etree import ElementTree
 import argparse
 import logging
 
+try:
+    import brotli
+except ImportError:  # Optional - .br siblings are skipped without it
+    brotli = None
+
+try:
+    import numpy as np
+except ImportError:  # Optional - related products cross-linking is skipped without it
+    np = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+
+# Process umask, read once at import since os.umask() can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Tags are replaced with spaces so adjacent text nodes never merge into one word
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def count_words(html_fragment: str) -> int:
+    """Count visible words in an HTML fragment."""
+    return len(HTML_TAG_RE.sub(' ', html_fragment).split())
+
+
+def parse_price_range(price_range: str) -> Optional[tuple]:
+    """Parse a '$549-699' style price range into (low, high); None if no price is present."""
+    values = [float(v.replace(',', '')) for v in re.findall(r'\d[\d,]*(?:\.\d+)?', price_range or '')]
+    if not values:
+        return None
+    return values[0], values[1] if len(values) > 1 else values[0]
+
+
+class TextAnalyzer:
+    """
+    Normalize, tokenize and shingle review text once, shared by every stage.
+    
+    Results are keyed by a hash of the raw text and kept in memory, so
+    quote dedupe and feature extraction read the same analysis instead of
+    re-tokenizing the text. Nothing is persisted: analysing a review costs
+    about as much as deserializing a stored analysis would.
+    """
+
+    TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+    def __init__(self, shingle_size: int = 3, max_entries: int = 50000):
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        """Analysis of a text: normalized form, tokens, shingle hashes and a dedupe hash."""
+        key = self.content_hash(text)
+        analysis = self._entries.get(key)
+        if analysis is None:
+            analysis = self._analyze(text)
+            analysis['hash'] = key
+            if len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order, so this drops the oldest analysis
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = analysis
+        return analysis
+
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Analysis previously computed for a content hash, if still cached."""
+        return self._entries.get(key) if key else None
+
+    def _analyze(self, text: str) -> Dict[str, Any]:
+        normalized = unicodedata.normalize('NFKC', html_unescape(HTML_TAG_RE.sub(' ', text)))
+        normalized = ' '.join(normalized.lower().split())
+        tokens = self.TOKEN_RE.findall(normalized)
+        size = self.shingle_size
+        shingles = {zlib.crc32(' '.join(tokens[i:i + size]).encode('utf-8'))
+                    for i in range(max(1, len(tokens) - size + 1))} if tokens else set()
+        return {
+            "normalized": normalized,
+            "normalized_hash": self.content_hash(normalized),
+            "tokens": tokens,
+            "shingles": sorted(shingles)
+        }
+
+class QuoteSelector:
+    """Keep the k most useful quotes per source and overall using bounded min-heaps."""
+
+    # Engagement count at which each signal saturates to 1.0 (log-scaled)
+    ENGAGEMENT_SCALES = {"helpful_votes": 50, "upvotes": 500, "likes": 200}
+    ENGAGEMENT_WEIGHT = 0.6
+    VERIFIED_WEIGHT = 0.2
+    RECENCY_WEIGHT = 0.2
+    RECENCY_HALF_LIFE_DAYS = 180
+
+    def __init__(self, top_n: int = 10, per_source: int = 5, now: Optional[datetime] = None):
+        self.top_n = top_n
+        self.per_source = per_source
+        self.now = now or datetime.now()
+        self._overall: List[tuple] = []
+        self._by_source: Dict[str, List[tuple]] = {}
+        self._counter = itertools.count()
+        # Best entry offered so far for each dedupe key, overall and per source
+        self._overall_best: Dict[str, tuple] = {}
+        self._source_best: Dict[str, Dict[str, tuple]] = {}
+
+    def score(self, review: Dict[str, Any]) -> float:
+        """Combine engagement, verification and recency into a 0-1 helpfulness score."""
+        engagement = 0.0
+        for signal, scale in self.ENGAGEMENT_SCALES.items():
+            votes = review.get(signal)
+            if votes:
+                engagement = max(engagement, min(1.0, math.log1p(votes) / math.log1p(scale)))
+
+        verified = 1.0 if review.get("verified") else 0.0
+
+        recency = 0.0
+        try:
+            age_days = max(0, (self.now - datetime.strptime(review.get("date", ""), "%Y-%m-%d")).days)
+            recency = 0.5 ** (age_days / self.RECENCY_HALF_LIFE_DAYS)
+        except (TypeError, ValueError):
+            pass
+
+        return (self.ENGAGEMENT_WEIGHT * engagement
+                + self.VERIFIED_WEIGHT * verified
+                + self.RECENCY_WEIGHT * recency)
+
+    def add(self, source: str, quote: Dict[str, Any], score: float, key: Optional[str] = None):
+        """
+        Offer a quote; it is kept only while it ranks in the top k.
+        
+        Quotes sharing a key (the same text syndicated across sources) are
+        kept once per list: the best-scoring copy replaces a weaker one.
+        """
+        # Negated sequence number makes earlier quotes win ties
+        entry = (score, -next(self._counter), quote)
+        self._push(self._overall, entry, self.top_n, key, self._overall_best)
+        self._push(self._by_source.setdefault(source, []), entry, self.per_source,
+                   key, self._source_best.setdefault(source, {}))
+
+    @staticmethod
+    def _push(heap: List[tuple], entry: tuple, limit: int,
+              key: Optional[str] = None, best: Optional[Dict[str, tuple]] = None):
+        if limit <= 0:
+            return
+        if key is not None:
+            previous = best.get(key)
+            if previous is not None and entry[:2] <= previous[:2]:
+                return
+            best[key] = entry
+            # Swapping a kept copy for a better one leaves the rest of the top k unchanged
+            position = next((i for i, kept in enumerate(heap) if kept is previous), None) if previous else None
+            if position is not None:
+                heap[position] = entry
+                heapq.heapify(heap)
+                return
+        if len(heap) < limit:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    def top_quotes(self) -> List[Dict[str, Any]]:
+        """Best quotes overall, most useful first."""
+        return [entry[2] for entry in sorted(self._overall, key=lambda e: e[:2], reverse=True)]
+
+    def quotes_by_source(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Best quotes for each source, most useful first."""
+        return {
+            source: [entry[2] for entry in sorted(heap, key=lambda e: e[:2], reverse=True)]
+            for source, heap in self._by_source.items()
+        }
+
+
+class OutputWriter:
+    """
+    Single writer for every generated file.
+    
+    Files are written atomically (temp file, fsync, rename) and get
+    precompressed .gz/.br siblings built in a thread pool. A manifest of
+    content hashes lets unchanged files skip both the write and the
+    recompression on later runs.
+    """
+
+    def __init__(self, manifest_path: str = ".output-manifest.json",
+                 encodings: Optional[List[str]] = None, workers: int = 4):
+        self.manifest_path = manifest_path
+        self.encodings = [e for e in (encodings or ["gzip", "brotli"])
+                          if e != "brotli" or brotli is not None]
+        self._manifest = self._load_manifest()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="compress")
+        self._pending: List[Future] = []
+
+    def _load_manifest(self) -> Dict[str, str]:
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Ignoring unreadable output manifest: {str(e)}")
+        return {}
+
+    @staticmethod
+    def atomic_write(filepath: str, data: bytes):
+        """Write bytes to a temp file in the same directory, fsync, then rename over filepath."""
+        directory = os.path.dirname(filepath) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(filepath) + '.', suffix='.tmp')
+        try:
+            # mkstemp creates 0600 files; keep the target's mode or use the default a plain open() would
+            try:
+                mode = os.stat(filepath).st_mode & 0o7777
+            except FileNotFoundError:
+                mode = 0o666 & ~_UMASK
+            os.fchmod(fd, mode)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _sibling_paths(self, filepath: str) -> List[str]:
+        suffixes = {"gzip": ".gz", "brotli": ".br"}
+        return [filepath + suffixes[e] for e in self.encodings]
+
+    def write(self, filepath: str, content) -> bool:
+        """
+        Write a generated file and schedule its compressed siblings.
+        
+        Returns:
+            False if the file was already up to date, True if it was written
+        """
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        key = os.path.normpath(filepath)
+
+        with self._lock:
+            unchanged = self._manifest.get(key) == digest
+        if unchanged and all(os.path.exists(p) for p in [filepath] + self._sibling_paths(filepath)):
+            return False
+
+        self.atomic_write(filepath, data)
+        with self._lock:
+            self._manifest.pop(key, None)
+        self._pending.append(self._executor.submit(self._compress, filepath, key, data, digest))
+        return True
+
+    def _compress(self, filepath: str, key: str, data: bytes, digest: str):
+        for encoding in self.encodings:
+            if encoding == "gzip":
+                self.atomic_write(filepath + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+            elif encoding == "brotli":
+                self.atomic_write(filepath + '.br', brotli.compress(data, quality=11))
+        # Only record the hash once every sibling exists, so failures retry next run
+        with self._lock:
+            self._manifest[key] = digest
+
+    def flush(self):
+        """Wait for pending compression and persist the manifest."""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"❌ Precompression failed: {str(e)}")
+        with self._lock:
+            manifest = json.dumps(self._manifest, indent=2, sort_keys=True)
+        self.atomic_write(self.manifest_path, manifest.encode('utf-8'))
+
+    def close(self):
+        """Flush outstanding work and stop the compression pool."""
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+
+class RelatedProductsIndex:
+    """
+    Nearest-neighbour index over the whole product catalog.
+    
+    Each product becomes a hashed, L2-normalised feature vector built from
+    its category, keywords, price range and review aspects. Neighbours are
+    found with batched matrix products, and adding products only computes
+    similarities for the new rows, merging them into existing neighbour
+    lists without a pairwise Python loop.
+    """
+
+    DIMENSIONS = 512
+    BATCH_SIZE = 256
+    ASPECT_TERMS = {
+        "battery", "display", "screen", "sound", "audio", "noise", "build", "setup",
+        "price", "value", "performance", "comfort", "camera", "design", "software",
+        "portable", "weight", "speed", "capacity", "cleaning", "durability", "fit"
+    }
+    KEYWORD_STOPWORDS = {"review", "reviews", "best", "worth", "buying", "guide", "long", "term", "the", "and", "for"}
+    FEATURE_WEIGHTS = {"category": 3.0, "category_token": 1.0, "keyword": 1.0, "price": 2.0, "aspect": 0.5}
+
+    def __init__(self, index_path: str = "data/related-products", neighbours: int = 5,
+                 text_analyzer: Optional[TextAnalyzer] = None):
+        self.index_path = index_path
+        self.k = neighbours
+        self.text_analyzer = text_analyzer or TextAnalyzer()
+        self.products: List[Dict[str, Any]] = []
+        self._positions: Dict[str, int] = {}
+        self.vectors = np.zeros((0, self.DIMENSIONS), dtype=np.float32)
+        self.neighbour_ids = np.zeros((0, self.k), dtype=np.int32)
+        self.neighbour_scores = np.zeros((0, self.k), dtype=np.float32)
+        self.load()
+
+    def load(self):
+        """Load the precomputed index from disk if present."""
+        meta_path, arrays_path = self.index_path + '.json', self.index_path + '.npz'
+        if not (os.path.exists(meta_path) and os.path.exists(arrays_path)):
+            return
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            products = json.load(f)
+        arrays = np.load(arrays_path)
+        if arrays['vectors'].shape != (len(products), self.DIMENSIONS) or arrays['neighbour_ids'].shape[1] != self.k:
+            logger.warning("⚠️ Related products index is out of date - rebuilding")
+            self.products = []
+            self._positions = {}
+            self.add([(p, self._vector_from_features(p['features'])) for p in products])
+            return
+        self.products = products
+        self._positions = {p['name']: i for i, p in enumerate(products)}
+        self.vectors = arrays['vectors']
+        self.neighbour_ids = arrays['neighbour_ids']
+        self.neighbour_scores = arrays['neighbour_scores']
+
+    def save(self):
+        """Persist metadata and arrays atomically."""
+        OutputWriter.atomic_write(self.index_path + '.json', json.dumps(self.products, indent=2).encode('utf-8'))
+        tmp_path = self.index_path + '.tmp.npz'
+        np.savez(tmp_path, vectors=self.vectors, neighbour_ids=self.neighbour_ids,
+                 neighbour_scores=self.neighbour_scores)
+        os.replace(tmp_path, self.index_path + '.npz')
+
+    @staticmethod
+    def _price_bucket(price_range: str) -> Optional[int]:
+        """Map a '$549-699' style range onto a log-scale bucket of its midpoint."""
+        prices = parse_price_range(price_range)
+        if prices is None:
+            return None
+        midpoint = sum(prices) / 2
+        return int(math.log2(max(midpoint, 1.0)) * 2)
+
+    def extract_features(self, product: Dict[str, Any], reviews_data: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+        """Turn a product (and optionally its reviews) into weighted named features."""
+        weights = self.FEATURE_WEIGHTS
+        features: Dict[str, float] = {}
+
+        def add(name: str, weight: float):
+            features[name] = features.get(name, 0.0) + weight
+
+        category = product.get('category', '').lower()
+        if category:
+            add(f"cat:{category}", weights["category"])
+            for token in re.findall(r'[a-z0-9]+', category):
+                add(f"cat_token:{token}", weights["category_token"])
+
+        for keyword in product.get('keywords', []):
+            for token in re.findall(r'[a-z0-9]+', keyword.lower()):
+                if len(token) > 2 and not token.isdigit() and token not in self.KEYWORD_STOPWORDS:
+                    add(f"kw:{token}", weights["keyword"])
+
+        bucket = self._price_bucket(product.get('price_range', ''))
+        if bucket is not None:
+            add(f"price:{bucket}", weights["price"])
+            # Adjacent buckets share some weight so nearby prices still match
+            add(f"price:{bucket - 1}", weights["price"] / 2)
+            add(f"price:{bucket + 1}", weights["price"] / 2)
+
+        if reviews_data:
+            for quote in reviews_data.get('key_quotes', []):
+                analysis = self.text_analyzer.get(quote.get('text_hash')) or self.text_analyzer.analyze(quote.get('text', ''))
+                for token in analysis['tokens']:
+                    if token in self.ASPECT_TERMS:
+                        add(f"aspect:{token}", weights["aspect"])
+
+        return features
+
+    def _vector_from_features(self, features: Dict[str, float]):
+        """Signed feature hashing into a fixed-width, unit-length vector."""
+        vector = np.zeros(self.DIMENSIONS, dtype=np.float32)
+        for name, weight in features.items():
+            digest = int(hashlib.md5(name.encode('utf-8')).hexdigest(), 16)
+            sign = 1.0 if (digest >> 64) & 1 else -1.0
+            vector[digest % self.DIMENSIONS] += sign * weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def upsert(self, product: Dict[str, Any], reviews_data: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Add or refresh a single product.
+        
+        A product whose page has never been written is pending (published
+        None) until set_published() records whether its page went out.
+        
+        Returns:
+            Other products whose neighbour lists changed (see add)
+        """
+        features = self.extract_features(product, reviews_data)
+        position = self._positions.get(product['name'])
+        published = self.products[position].get('published', True) if position is not None else None
+        entry = {
+            "name": product['name'],
+            "category": product.get('category', ''),
+            "price_range": product.get('price_range', ''),
+            "amazon_url": product.get('amazon_url', ''),
+            "keywords": product.get('keywords', []),
+            "total_reviews": (reviews_data or {}).get('total_reviews', 0),
+            "published": True if published else None,
+            "features": features
+        }
+        return self.add([(entry, self._vector_from_features(features))])
+
+    def set_published(self, name: str, published: bool) -> bool:
+        """
+        Record whether a product's page was written.
+        
+        A product with a page from an earlier run stays linkable even if
+        this run rejected it. Returns True if the product stopped being
+        linkable.
+        """
+        position = self._positions.get(name)
+        if position is None:
+            return False
+        entry = self.products[position]
+        if published:
+            entry['published'] = True
+            return False
+        if entry.get('published', True) is True:
+            return False
+        entry['published'] = False
+        return True
+
+    def add(self, entries: List[tuple]) -> List[str]:
+        """
+        Insert or replace products and update neighbour lists incrementally.
+        
+        Changed rows, and rows whose neighbour lists included a changed
+        product, get a full top-k over the catalog; every other row merges
+        the changed rows into its existing top-k in one vectorised step.
+        
+        Returns:
+            Names of the other products whose neighbour lists changed or
+            list a changed product, i.e. whose pages link stale data
+        """
+        if not entries:
+            return []
+        previous_ids = self.neighbour_ids.copy()
+        changed = []
+        new_vectors = []
+        for entry, vector in entries:
+            position = self._positions.get(entry['name'])
+            if position is None:
+                position = len(self.products)
+                self._positions[entry['name']] = position
+                self.products.append(entry)
+                new_vectors.append(vector)
+            else:
+                self.products[position] = entry
+                self.vectors[position] = vector
+            changed.append(position)
+
+        if new_vectors:
+            added = len(new_vectors)
+            self.vectors = np.vstack([self.vectors, np.asarray(new_vectors, dtype=np.float32)])
+            self.neighbour_ids = np.vstack([self.neighbour_ids, np.full((added, self.k), -1, dtype=np.int32)])
+            self.neighbour_scores = np.vstack([self.neighbour_scores, np.full((added, self.k), -np.inf, dtype=np.float32)])
+
+        changed = np.unique(np.asarray(changed, dtype=np.int32))
+        # A row that listed a changed product may have dropped better candidates to make
+        # room for it, so such rows (and the changed rows) get a full top-k recompute
+        stale_rows = np.flatnonzero(np.isin(self.neighbour_ids, changed).any(axis=1))
+        recompute = np.union1d(changed, stale_rows).astype(np.int32)
+        for start in range(0, len(recompute), self.BATCH_SIZE):
+            rows = recompute[start:start + self.BATCH_SIZE]
+            similarities = self.vectors[rows] @ self.vectors.T  # (batch, catalog)
+            similarities[np.arange(len(rows)), rows] = -np.inf
+            self.neighbour_ids[rows], self.neighbour_scores[rows] = self._top_k(similarities)
+
+        # Every other row only needs the changed rows merged in as new candidates
+        others = np.setdiff1d(np.arange(len(self.products)), recompute)
+        for start in range(0, len(changed) if len(others) else 0, self.BATCH_SIZE):
+            rows = changed[start:start + self.BATCH_SIZE]
+            candidate_scores = self.vectors[others] @ self.vectors[rows].T  # (others, batch)
+            candidate_ids = np.broadcast_to(rows, candidate_scores.shape)
+            merged_scores = np.hstack([self.neighbour_scores[others], candidate_scores])
+            merged_ids = np.hstack([self.neighbour_ids[others], candidate_ids])
+            ids, scores = self._top_k(merged_scores, merged_ids)
+            self.neighbour_ids[others] = ids
+            self.neighbour_scores[others] = scores
+
+        existing = len(previous_ids)
+        affected = np.isin(self.neighbour_ids[:existing], changed).any(axis=1)
+        affected |= (self.neighbour_ids[:existing] != previous_ids).any(axis=1)
+        affected[changed[changed < existing]] = False
+        return [self.products[row]['name'] for row in np.flatnonzero(affected)]
+
+    def _top_k(self, scores, ids=None):
+        """Row-wise top-k (descending) of a score matrix, padded with -1/-inf."""
+        if scores.shape[1] < self.k:
+            pad = self.k - scores.shape[1]
+            scores = np.hstack([scores, np.full((scores.shape[0], pad), -np.inf, dtype=scores.dtype)])
+            if ids is not None:
+                ids = np.hstack([ids, np.full((ids.shape[0], pad), -1, dtype=np.int32)])
+        if ids is None:
+            ids = np.broadcast_to(np.arange(scores.shape[1], dtype=np.int32), scores.shape)
+        part = np.argpartition(-scores, self.k - 1, axis=1)[:, :self.k]
+        part_scores = np.take_along_axis(scores, part, axis=1)
+        order = np.argsort(-part_scores, axis=1, kind='stable')
+        top = np.take_along_axis(part, order, axis=1)
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        top_ids = np.take_along_axis(ids, top, axis=1).astype(np.int32)
+        top_ids[~np.isfinite(top_scores)] = -1
+        return top_ids, top_scores.astype(np.float32)
+
+    def rebuild(self):
+        """Recompute every neighbour list exactly, in batches."""
+        for start in range(0, len(self.products), self.BATCH_SIZE):
+            rows = np.arange(start, min(start + self.BATCH_SIZE, len(self.products)))
+            similarities = self.vectors[rows] @ self.vectors.T
+            similarities[np.arange(len(rows)), rows] = -np.inf
+            self.neighbour_ids[rows], self.neighbour_scores[rows] = self._top_k(similarities)
+
+    def neighbours(self, name: str, limit: Optional[int] = None, min_score: float = 0.0) -> List[Dict[str, Any]]:
+        """Most similar products to the named one that have (or may get) a page, best first."""
+        position = self._positions.get(name)
+        if position is None:
+            return []
+        related = []
+        for neighbour, score in zip(self.neighbour_ids[position], self.neighbour_scores[position]):
+            if neighbour < 0 or score <= min_score or self.products[neighbour].get('published') is False:
+                continue
+            entry = {k: v for k, v in self.products[neighbour].items() if k not in ('features', 'published')}
+            related.append(dict(entry, similarity=float(score)))
+        return related[:limit] if limit else related
+
+
+class SnapshotArchive:
+    """
+    Append-only, columnar archive of per-run product snapshots.
+    
+    Each column lives in its own raw binary file and is read through
+    numpy memory maps, so range queries only touch the pages they need.
+    Rows are appended in run order, which keeps the run_time column
+    sorted and lets time ranges be found with a binary search. The
+    committed row count in schema.json is written last, so a crash
+    mid-append never exposes a partial run.
+    """
+
+    BASE_COLUMNS = {
+        "run_time": "<i8",
+        "product_id": "<i4",
+        "category_id": "<i4",
+        "average_rating": "<f4",
+        "total_reviews": "<i4",
+        "price_min": "<f4",
+        "price_max": "<f4"
+    }
+
+    def __init__(self, directory: str = "data/snapshots"):
+        self.directory = directory
+        self.schema_path = os.path.join(directory, "schema.json")
+        self.schema = self._load_schema()
+        self._ids: Dict[str, Dict[str, int]] = {}
+        self._maps: Dict[str, Any] = {}
+
+    def _load_schema(self) -> Dict[str, Any]:
+        if os.path.exists(self.schema_path):
+            with open(self.schema_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {"row_count": 0, "columns": dict(self.BASE_COLUMNS), "products": [], "categories": [], "sources": []}
+
+    def _column_path(self, column: str) -> str:
+        return os.path.join(self.directory, f"{column}.bin")
+
+    @staticmethod
+    def _source_column(source: str) -> str:
+        return f"source_{re.sub(r'[^a-z0-9]+', '_', source.lower())}"
+
+    def _lookup(self, table: str) -> Dict[str, int]:
+        """Value -> id map for an interned table, built once per table."""
+        if table not in self._ids:
+            self._ids[table] = {v: i for i, v in enumerate(self.schema[table])}
+        return self._ids[table]
+
+    def _intern(self, table: str, value: str) -> int:
+        ids = self._lookup(table)
+        if value not in ids:
+            ids[value] = len(self.schema[table])
+            self.schema[table].append(value)
+        return ids[value]
+
+    def append_run(self, snapshots: List[Dict[str, Any]], run_time: Optional[datetime] = None):
+        """
+        Append one run's product snapshots.
+        
+        Args:
+            snapshots: Dictionaries with name, category, average_rating,
+                total_reviews, price_range and source_counts
+            run_time: Time of the run (defaults to now)
+        """
+        if not snapshots:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        timestamp = int((run_time or datetime.now()).timestamp())
+        row_count = self.schema["row_count"]
+        columns = self.schema["columns"]
+
+        # Discard any torn tail left by an interrupted append
+        for column, dtype in columns.items():
+            path = self._column_path(column)
+            if os.path.exists(path):
+                with open(path, 'r+b') as f:
+                    f.truncate(row_count * np.dtype(dtype).itemsize)
+
+        for snapshot in snapshots:
+            for source in snapshot["source_counts"]:
+                column = self._source_column(source)
+                if column not in columns:
+                    # New sources start with zero counts for every earlier row
+                    columns[column] = "<i4"
+                    self.schema["sources"].append(source)
+                    np.zeros(row_count, dtype="<i4").tofile(self._column_path(column))
+
+        rows = {column: np.zeros(len(snapshots), dtype=dtype) for column, dtype in columns.items()}
+        for i, snapshot in enumerate(snapshots):
+            prices = parse_price_range(snapshot.get("price_range", ""))
+            rows["run_time"][i] = timestamp
+            rows["product_id"][i] = self._intern("products", snapshot["name"])
+            rows["category_id"][i] = self._intern("categories", snapshot.get("category", ""))
+            rating = snapshot.get("average_rating")
+            rows["average_rating"][i] = np.nan if rating is None else rating
+            rows["total_reviews"][i] = snapshot.get("total_reviews", 0)
+            rows["price_min"][i], rows["price_max"][i] = prices if prices else (np.nan, np.nan)
+            for source, count in snapshot["source_counts"].items():
+                rows[self._source_column(source)][i] = count
+
+        for column, values in rows.items():
+            with open(self._column_path(column), 'ab') as f:
+                values.tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+
+        self.schema["row_count"] = row_count + len(snapshots)
+        OutputWriter.atomic_write(self.schema_path, json.dumps(self.schema, indent=2).encode('utf-8'))
+        self._maps = {}
+
+    def _column(self, column: str):
+        if column not in self._maps:
+            count = self.schema["row_count"]
+            dtype = self.schema["columns"][column]
+            self._maps[column] = (np.memmap(self._column_path(column), dtype=dtype, mode='r', shape=(count,))
+                                  if count else np.zeros(0, dtype=dtype))
+        return self._maps[column]
+
+    def source_columns(self) -> Dict[str, str]:
+        """Map of source name to its count column."""
+        return {source: self._source_column(source) for source in self.schema["sources"]}
+
+    def query(self, product: Optional[str] = None, category: Optional[str] = None,
+              start: Optional[datetime] = None, end: Optional[datetime] = None,
+              columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Return matching rows as a dict of column arrays, ordered by run time.
+        
+        Only the time slice found by binary search is scanned, and only
+        the requested columns are read.
+        """
+        columns = columns or list(self.schema["columns"])
+        run_times = self._column("run_time")
+        lo = int(np.searchsorted(run_times, int(start.timestamp()), 'left')) if start else 0
+        hi = int(np.searchsorted(run_times, int(end.timestamp()), 'right')) if end else len(run_times)
+
+        mask = None
+        for key, table, value in (("product_id", "products", product), ("category_id", "categories", category)):
+            if value is None:
+                continue
+            ids = self._lookup(table)
+            if value not in ids:
+                return {column: np.zeros(0, dtype=self.schema["columns"][column]) for column in columns}
+            match = self._column(key)[lo:hi] == ids[value]
+            mask = match if mask is None else mask & match
+
+        rows = np.flatnonzero(mask) + lo if mask is not None else np.arange(lo, hi)
+        return {column: np.asarray(self._column(column)[rows]) for column in columns}
+
+    def trend(self, product: str, column: str, start: Optional[datetime] = None,
+              end: Optional[datetime] = None) -> tuple:
+        """(run_times, values) history of one column for one product."""
+        result = self.query(product=product, start=start, end=end, columns=["run_time", column])
+        return result["run_time"], result[column]
+
+
+class _OutboundLinkParser(HTMLParser):
+    """Collect absolute http(s) URLs and relative file links from href and src attributes."""
+
+    def __init__(self):
+        super().__init__()
+        self.links: Set[str] = set()
+        self.local: Set[str] = set()
+
+    def handle_starttag(self, tag, attrs):
+        for name, value in attrs:
+            if name not in ('href', 'src') or not value:
+                continue
+            value = value.strip()
+            if value.startswith(('http://', 'https://')):
+                self.links.add(value)
+            elif not re.match(r'[a-zA-Z][\w+.-]*:|//|#', value):
+                self.local.add(value)
+
+
+class LinkChecker:
+    """
+    Post-build checker for outbound links and images.
+    
+    URLs are checked concurrently with asyncio, limited globally and per
+    host. Results are cached with a TTL so healthy links are not
+    rechecked every build; failures are always rechecked.
+    """
+
+    USER_AGENT = "AI-Review-Harvester-LinkChecker/1.0"
+    MAX_REDIRECTS = 5
+    # Some servers reject HEAD outright; retry those with GET
+    HEAD_FALLBACK_STATUSES = {403, 405, 501}
+
+    def __init__(self, cache_path: str = "data/link-cache.json", ttl_hours: float = 24,
+                 concurrency: int = 20, per_host: int = 2, timeout: float = 10.0):
+        self.cache_path = cache_path
+        self.ttl = ttl_hours * 3600
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.cache = self._load_cache()
+        # Relative links to files missing from the site tree, filled by collect_pages
+        self.missing_local: Dict[str, List[str]] = {}
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Ignoring unreadable link cache: {str(e)}")
+        return {}
+
+    @staticmethod
+    def extract_links(html_content: str) -> Set[str]:
+        """All outbound URLs referenced by a page."""
+        parser = _OutboundLinkParser()
+        parser.feed(html_content)
+        return parser.links
+
+    @staticmethod
+    def _local_target(page_path: str, link: str) -> Optional[str]:
+        """File a relative link points at, resolved against the page's directory."""
+        path = unquote(urlsplit(link).path)
+        if not path:
+            return None
+        target = os.path.normpath(os.path.join(os.path.dirname(page_path), path))
+        return os.path.join(target, 'index.html') if path.endswith('/') else target
+
+    def collect_pages(self, paths: List[str]) -> Dict[str, Set[str]]:
+        """
+        Map each HTML file under the given files/directories to its outbound URLs.
+        
+        Relative links to files that do not exist are recorded in
+        missing_local and reported by check_pages.
+        """
+        pages = {}
+        for path in paths:
+            if os.path.isdir(path):
+                files = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.html'))
+            elif os.path.exists(path):
+                files = [path]
+            else:
+                continue
+            for filepath in files:
+                parser = _OutboundLinkParser()
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    parser.feed(f.read())
+                pages[filepath] = parser.links
+                missing = []
+                for link in sorted(parser.local):
+                    target = self._local_target(filepath, link)
+                    if target and not os.path.exists(target):
+                        missing.append(link)
+                if missing:
+                    self.missing_local[filepath] = missing
+        return pages
+
+    async def _request_status(self, url: str, method: str) -> tuple:
+        """Send a single request and return (status, location header)."""
+        parts = urlsplit(url)
+        secure = parts.scheme == 'https'
+        port = parts.port or (443 if secure else 80)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        reader, writer = await asyncio.open_connection(
+            parts.hostname, port,
+            ssl=ssl.create_default_context() if secure else None,
+            server_hostname=parts.hostname if secure else None
+        )
+        try:
+            host = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+            writer.write(
+                f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: {self.USER_AGENT}\r\n"
+                f"Accept: */*\r\nConnection: close\r\n\r\n".encode('latin-1')
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            status = int(status_line.split()[1])
+            location = None
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.strip().lower() == 'location':
+                    location = value.strip()
+            return status, location
+        finally:
+            writer.close()
+
+    async def _check_url(self, url: str, global_limit: asyncio.Semaphore,
+                         host_limits: Dict[str, asyncio.Semaphore]) -> Dict[str, Any]:
+        """Check one URL, following redirects, under the global and per-host limits."""
+        result = {"url": url, "ok": False, "status": None, "error": None}
+        target = url
+        method = 'HEAD'
+        try:
+            for _ in range(self.MAX_REDIRECTS + 1):
+                host = urlsplit(target).netloc
+                host_limit = host_limits.setdefault(host, asyncio.Semaphore(self.per_host))
+                async with host_limit, global_limit:
+                    status, location = await asyncio.wait_for(self._request_status(target, method), self.timeout)
+                if method == 'HEAD' and status in self.HEAD_FALLBACK_STATUSES:
+                    method = 'GET'
+                    continue
+                if 300 <= status < 400 and location:
+                    target = urljoin(target, location)
+                    continue
+                result["status"] = status
+                result["ok"] = status < 400
+                break
+            else:
+                result["error"] = "too many redirects"
+        except asyncio.TimeoutError:
+            result["error"] = "timeout"
+        except (OSError, ValueError, IndexError) as e:
+            result["error"] = str(e) or e.__class__.__name__
+        result["checked_at"] = time.time()
+        return result
+
+    async def _check_urls(self, urls: List[str]) -> List[Dict[str, Any]]:
+        global_limit = asyncio.Semaphore(self.concurrency)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        return await asyncio.gather(*(self._check_url(url, global_limit, host_limits) for url in urls))
+
+    def check_pages(self, pages: Dict[str, Set[str]]) -> Dict[str, Any]:
+        """
+        Check every outbound URL once and build a per-page failure report.
+        
+        Args:
+            pages: Page path to the URLs it references (see collect_pages)
+            
+        Returns:
+            Report with per-page failures and summary counts
+        """
+        now = time.time()
+        all_urls = set().union(*pages.values()) if pages else set()
+        stale = sorted(
+            url for url in all_urls
+            if not (self.cache.get(url, {}).get("ok") and now - self.cache[url]["checked_at"] < self.ttl)
+        )
+
+        if stale:
+            logger.info(f"🔗 Checking {len(stale)} links ({len(all_urls) - len(stale)} cached)...")
+            for result in asyncio.run(self._check_urls(stale)):
+                self.cache[result.pop("url")] = result
+            OutputWriter.atomic_write(self.cache_path, json.dumps(self.cache, indent=2, sort_keys=True).encode('utf-8'))
+
+        failures = {}
+        for page, urls in sorted(pages.items()):
+            broken = [
+                {"url": url, "status": self.cache[url]["status"], "error": self.cache[url]["error"]}
+                for url in sorted(urls) if not self.cache[url]["ok"]
+            ]
+            broken += [{"url": link, "status": None, "error": "missing file"}
+                       for link in self.missing_local.get(page, [])]
+            if broken:
+                failures[page] = broken
+
+        return {
+            "checked_at": datetime.now().isoformat(timespec='seconds'),
+            "summary": {
+                "pages": len(pages),
+                "links": len(all_urls),
+                "checked": len(stale),
+                "broken": sum(1 for url in all_urls if not self.cache[url]["ok"]),
+                "missing_local": sum(len(self.missing_local.get(page, [])) for page in pages)
+            },
+            "failures": failures
+        }
+
+
+class _DomHookParser(HTMLParser):
+    """Collect the ids, classes and attributes a page exposes as simple selectors."""
+
+    def __init__(self):
+        super().__init__()
+        self.hooks: Set[str] = set()
+
+    def handle_starttag(self, tag, attrs):
+        self.hooks.add(tag)
+        for name, value in attrs:
+            self.hooks.add(f"[{name}]")
+            if name == 'id' and value:
+                self.hooks.add(f"#{value}")
+            elif name == 'class' and value:
+                self.hooks.update(f".{cls}" for cls in value.split())
+            elif name == 'href' and value and value.startswith('#'):
+                self.hooks.add('a[href^="#"]')
+
+
+class ScriptBundler:
+    """
+    Build per-page JavaScript bundles from the sections of scripts.js.
+    
+    scripts.js is split on its "// ===== SECTION =====" headers. A page
+    gets only the sections whose DOM hooks it contains (plus the sections
+    those depend on), in one fingerprinted bundle shared by every page
+    with the same feature set. Heavy sections are emitted as separate
+    files and loaded on first interaction, visibility or scroll.
+    """
+
+    SECTION_RE = re.compile(r'^// ===== (.+?) =====\s*$', re.MULTILINE)
+    DECLARATION_RE = re.compile(r'^(?:function\s+([\w$]+)|const\s+([\w$]+)\s*=|window\.([\w$]+)\s*=)', re.MULTILINE)
+
+    # hooks: any matching selector enables the section; init: called once the section is loaded
+    # lazy: load on "interact"/"visible" (of the hook elements) or first "scroll" instead of upfront
+    MODULES = {
+        "DOM UTILITIES": {"always": True},
+        "INITIALIZATION": {"exclude": True},
+        "LOADING SCREEN": {"hooks": ["#loading-screen"], "init": ["initializeLoader"]},
+        "NAVIGATION": {"hooks": ["#navbar", "#hamburger", ".nav-menu"], "init": ["initializeNavigation"]},
+        "DARK MODE": {"hooks": ["#theme-toggle"], "init": ["initializeDarkMode"]},
+        "SMOOTH SCROLLING": {"hooks": ['a[href^="#"]'], "init": ["initializeSmoothScrolling"]},
+        "SCROLL ANIMATIONS": {"hooks": [".review-card", ".category-card", ".feature-item"],
+                              "init": ["initializeScrollAnimations"]},
+        "ANIMATED COUNTERS": {"hooks": [".stat-number"], "init": ["initializeCounters"]},
+        "BACK TO TOP BUTTON": {"hooks": ["#backToTop"], "init": ["initializeBackToTop"]},
+        "NEWSLETTER FORM": {"hooks": [".subscribe-form"], "init": ["initializeNewsletterForm"]},
+        "SEARCH SYSTEM": {"hooks": ["#search-input", ".search-form"], "init": ["initializeSearchSystem"],
+                          "lazy": "interact"},
+        "NOTIFICATION SYSTEM": {},
+        "AOS INITIALIZATION": {"hooks": ["[data-aos]"], "init": ["initializeAOS"]},
+        "UTILITY FUNCTIONS": {"always": True},
+        "ENHANCED INTERACTIONS": {"hooks": [".review-card", ".category-card", ".btn-primary", ".btn-secondary", ".btn-outline"]},
+        "SCROLL PROGRESS INDICATOR": {"hooks": [".review-article"], "init": ["initializeScrollProgress"],
+                                      "lazy": "scroll"},
+        "PERFORMANCE OPTIMIZATIONS": {"hooks": [".review-card"]},
+        "ACCESSIBILITY ENHANCEMENTS": {"hooks": ["#hamburger", ".nav-link", ".btn-primary", ".btn-secondary", ".btn-outline"]},
+        "IMAGE HANDLING & FALLBACK SYSTEM": {"hooks": ["img"], "init": ["initializeImageHandling", "injectImageStyles"]},
+        "ERROR HANDLING": {"always": True},
+        "CONSOLE BRANDING": {"exclude": True},
+        "PROFESSIONAL IMAGE GALLERY SYSTEM": {"hooks": [".gallery-item", ".faq-content"], "init": ["initializeImageGallery"],
+                                              "lazy": "visible"},
+        "ENHANCED IMAGE LAZY LOADING": {"hooks": ["[data-src]"]},
+        "GLOBAL LIGHTBOX FOR REVIEWS": {"hooks": ["[data-lightbox]", ".gallery-item"]},
+        "COMPARISON FUNCTIONALITY": {"hooks": [".compare-btn", ".comparison-badge"]}
+    }
+
+    LAZY_LOADER = """
+// ===== LAZY MODULES =====
+(function() {
+    const modules = %s;
+
+    function load(module) {
+        if (!module.promise) {
+            module.promise = new Promise(function(resolve, reject) {
+                const script = document.createElement('script');
+                script.src = module.src;
+                script.onload = resolve;
+                script.onerror = reject;
+                document.head.appendChild(script);
+            }).then(function() {
+                module.init.forEach(function(name) {
+                    try {
+                        window[name]();
+                    } catch (error) {
+                        console.error('Error initializing ' + name + ':', error);
+                    }
+                });
+            });
+        }
+        return module.promise;
+    }
+
+    document.addEventListener('DOMContentLoaded', function() {
+        modules.forEach(function(module) {
+            const elements = document.querySelectorAll(module.selector);
+            const trigger = function() { load(module); };
+            if (module.on === 'scroll') {
+                window.addEventListener('scroll', trigger, { once: true, passive: true });
+            } else if (module.on === 'visible' && 'IntersectionObserver' in window) {
+                const observer = new IntersectionObserver(function(entries) {
+                    if (entries.some(function(entry) { return entry.isIntersecting; })) {
+                        observer.disconnect();
+                        trigger();
+                    }
+                }, { rootMargin: '200px' });
+                elements.forEach(function(element) { observer.observe(element); });
+            } else if (module.on === 'interact') {
+                elements.forEach(function(element) {
+                    ['focusin', 'pointerenter', 'touchstart'].forEach(function(type) {
+                        element.addEventListener(type, trigger, { once: true, passive: true });
+                    });
+                });
+            } else {
+                trigger();
+            }
+        });
+    });
+})();
+"""
+
+    def __init__(self, output_writer: OutputWriter, source_path: str = "scripts.js", output_dir: str = "assets/js"):
+        self.output_writer = output_writer
+        self.output_dir = output_dir
+        self.source_name = os.path.basename(source_path)
+        try:
+            with open(source_path, 'r', encoding='utf-8') as f:
+                self.sections = self._split_sections(f.read())
+        except FileNotFoundError:
+            # Pages then reference the unsplit script from the site root instead of a bundle
+            logger.warning(f"⚠️ {source_path} not found - pages will load {self.source_name} unbundled")
+            self.sections = None
+        self.dependencies = self._find_dependencies() if self.sections is not None else {}
+        self._bundles: Dict[tuple, str] = {}
+
+    def _split_sections(self, source: str) -> Dict[str, str]:
+        """Section title to its source, in file order (the file preamble is dropped)."""
+        sections = {}
+        matches = list(self.SECTION_RE.finditer(source))
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(source)
+            sections[match.group(1)] = source[match.start():end].rstrip() + "\n"
+        for title in sections:
+            if title not in self.MODULES:
+                logger.warning(f"⚠️ scripts.js section '{title}' has no bundle rule - always included")
+        return sections
+
+    def _find_dependencies(self) -> Dict[str, Set[str]]:
+        """Sections each section calls into, found from top-level declarations."""
+        declared = {}
+        for title, source in self.sections.items():
+            for match in self.DECLARATION_RE.finditer(source):
+                declared[next(name for name in match.groups() if name)] = title
+        dependencies = {}
+        for title, source in self.sections.items():
+            dependencies[title] = {
+                owner for name, owner in declared.items()
+                if owner != title and re.search(r'(?<![\w$.])' + re.escape(name) + r'\s*\(', source)
+            }
+        return dependencies
+
+    @staticmethod
+    def page_hooks(html_content: str) -> Set[str]:
+        """DOM hooks (simple selectors) present in a rendered page."""
+        parser = _DomHookParser()
+        parser.feed(html_content)
+        return parser.hooks
+
+    def select_sections(self, hooks: Set[str]) -> List[str]:
+        """Sections whose rules match a page's hooks (before dependencies), in file order."""
+        selected = []
+        for title in self.sections or {}:
+            rule = self.MODULES.get(title, {"always": True})
+            if rule.get("exclude"):
+                continue
+            if rule.get("always") or hooks.intersection(rule.get("hooks", [])):
+                selected.append(title)
+        return selected
+
+    def _with_dependencies(self, titles: List[str]) -> List[str]:
+        """Titles plus everything they transitively call into, in file order."""
+        selected = set()
+        pending = list(titles)
+        while pending:
+            title = pending.pop()
+            if title not in selected:
+                selected.add(title)
+                pending.extend(self.dependencies[title] - selected)
+        return [title for title in self.sections if title in selected]
+
+    def _write_asset(self, name: str, content: str, site_root: str) -> str:
+        """Write a fingerprinted asset under site_root and return its path relative to that root."""
+        fingerprint = hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+        path = f"{self.output_dir}/{name}-{fingerprint}.js"
+        self.output_writer.write(os.path.join(site_root, path), content)
+        return path
+
+    def bundle_for(self, html_content: str, asset_prefix: str = "", site_root: str = ".") -> str:
+        """
+        Build (or reuse) the bundle for a page and return the script tag to include.
+        
+        Args:
+            html_content: Rendered page
+            asset_prefix: Relative path from the page to the site root (e.g. "../")
+            site_root: Directory of the site tree the page is written to
+        """
+        return self.bundle_tag(self.select_sections(self.page_hooks(html_content)), asset_prefix, site_root)
+
+    def bundle_tag(self, sections: List[str], asset_prefix: str = "", site_root: str = ".") -> str:
+        """Script tag for an already selected set of sections (see select_sections)."""
+        if self.sections is None:
+            return f'<script src="{asset_prefix}{self.source_name}"></script>'
+        key = (tuple(sections), asset_prefix, site_root)
+        if key not in self._bundles:
+            lazy = [t for t in sections if self.MODULES.get(t, {}).get("lazy")]
+            eager = self._with_dependencies([t for t in sections if t not in lazy])
+
+            lazy_modules = []
+            for title in lazy:
+                rule = self.MODULES[title]
+                # Dependencies the eager bundle doesn't already provide travel with the lazy file
+                content = "".join(self.sections[t] for t in self._with_dependencies([title]) if t not in eager)
+                slug = re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')
+                lazy_modules.append({
+                    "src": asset_prefix + self._write_asset(slug, content, site_root),
+                    "init": rule.get("init", []),
+                    "on": rule["lazy"],
+                    "selector": ", ".join(rule.get("hooks", [])) or "body"
+                })
+
+            init_calls = [name for t in eager for name in self.MODULES.get(t, {}).get("init", [])]
+            bootstrap = (
+                "\n// ===== INITIALIZATION =====\n"
+                "document.addEventListener('DOMContentLoaded', function() {\n"
+                f"    [{', '.join(init_calls)}].forEach(function(init) {{\n"
+                "        try {\n"
+                "            init();\n"
+                "        } catch (error) {\n"
+                "            console.error('Error during initialization:', error);\n"
+                "        }\n"
+                "    });\n"
+                "});\n"
+            )
+            content = "".join(self.sections[t] for t in eager) + bootstrap
+            if lazy_modules:
+                content += self.LAZY_LOADER % json.dumps(lazy_modules, indent=4).replace('\n', '\n    ')
+            self._bundles[key] = asset_prefix + self._write_asset("bundle", content, site_root)
+        return f'<script src="{self._bundles[key]}" defer></script>'
+
+
 class ReviewHarvester:
     """Main automation class for the AI Review Harvester workflow."""
+
+    # Replaced with the page's script bundle tag once the page is rendered
+    SCRIPTS_PLACEHOLDER = "<!-- page-scripts -->"
+
+    # Variant-specific values are rendered as {{slot:name}} / {{slot:name:arg}} and filled per variant
+    SLOT_RE = re.compile(r'\{\{slot:(\w+)(?::([^}]*))?\}\}')
+
+    VARIANT_STRINGS = {
+        "where_to_buy": "Where to Buy & Best Deals",
+        "view_on_amazon": "View on Amazon",
+        "check_pricing": "Check for latest pricing",
+        "updated": "Updated"
+    }
+
+    # Rated reviews needed before rating confidence reaches 0.5
+    RATING_CONFIDENCE_PRIOR = 50
+
+    SOURCE_LABELS = {
+        "amazon": "Amazon Verified Buyer",
+        "reddit": "Reddit User",
+        "youtube": "YouTube Viewer",
+        "google": "Google Shopping Review"
+    }
     
     def __init__(self, config_path: str = "config.json"):
         """Initialize with configuration."""
         self.config = self.load_config(config_path)
         self.github_token = os.environ.get('GITHUB_TOKEN', self.config.get('github_token'))
         self.affiliate_tag = self.config.get('affiliate_tag', 'reviews-20')
+        output_settings = self.config.get('output_settings', {})
+        self.output_writer = OutputWriter(
+            manifest_path=output_settings.get('manifest_path', '.output-manifest.json'),
+            encodings=output_settings.get('precompress'),
+            workers=output_settings.get('compression_workers', 4)
+        )
+        text_settings = self.config.get('text_analysis', {})
+        self.text_analyzer = TextAnalyzer(
+            shingle_size=text_settings.get('shingle_size', 3),
+            max_entries=text_settings.get('max_entries', 50000)
+        )
+        related_settings = self.config.get('related_products', {})
+        if np is not None:
+            self.related_index = RelatedProductsIndex(
+                index_path=related_settings.get('index_path', 'data/related-products'),
+                neighbours=related_settings.get('neighbours', 5),
+                text_analyzer=self.text_analyzer
+            )
+        else:
+            logger.warning("⚠️ numpy not installed - related product cross-linking disabled")
+            self.related_index = None
+        bundle_settings = self.config.get('script_bundles', {})
+        self.script_bundler = ScriptBundler(
+            self.output_writer,
+            source_path=self._resolve_source_path(bundle_settings.get('source', 'scripts.js'), config_path),
+            output_dir=bundle_settings.get('output_dir', 'assets/js')
+        )
+        history_settings = self.config.get('history_settings', {})
+        self.snapshot_archive = (SnapshotArchive(history_settings.get('snapshot_dir', 'data/snapshots'))
+                                 if np is not None else None)
         
+    @staticmethod
+    def _resolve_source_path(path: str, config_path: str) -> str:
+        """Resolve a relative source file against the config file's directory, then this module's."""
+        if os.path.isabs(path):
+            return path
+        candidates = [os.path.join(os.path.dirname(os.path.abspath(config_path)), path),
+                      os.path.join(os.path.dirname(os.path.abspath(__file__)), path)]
+        return next((candidate for candidate in candidates if os.path.exists(candidate)), candidates[0])
+    
     def load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from JSON file."""
         default_config = {
             "github_repo": "arhilevo-lab/ai-review-harvester",
             "github_token": "",
+            "site_url": "https://arhilevo-lab.github.io/ai-review-harvester/",
             "affiliate_tag": "reviews-20",
             "min_reviews_per_product": 50,
             "review_sources": ["amazon", "reddit", "youtube", "google"],
             "target_word_count": 2000,
+            "max_key_quotes": 10,
+            "max_quotes_per_source": 5,
             "seo_keywords": {
                 "primary": ["review", "2025", "worth it", "pros cons"],
                 "secondary": ["user experience", "real review", "buying guide"]
+            },
+            "output_settings": {
+                "manifest_path": ".output-manifest.json",
+                "precompress": ["gzip", "brotli"],
+                "compression_workers": 4
+            },
+            "related_products": {
+                "index_path": "data/related-products",
+                "neighbours": 5,
+                "compare_links": 3,
+                "min_similarity": 0.2
+            },
+            "history_settings": {
+                "snapshot_dir": "data/snapshots",
+                "trend_days": 365
+            },
+            "link_checker": {
+                "paths": ["index.html", "reviews", "categories", "comparisons"],
+                "cache_path": "data/link-cache.json",
+                "report_path": "data/link-report.json",
+                "cache_ttl_hours": 24,
+                "concurrency": 20,
+                "per_host_concurrency": 2,
+                "timeout_seconds": 10
+            },
+            "script_bundles": {
+                "source": "scripts.js",
+                "output_dir": "assets/js"
+            },
+            "source_cache": {
+                "dir": "data/source-cache",
+                "ttl_hours": 12,
+                "full_resync_days": 7,
+                "max_stored_reviews": 200
+            },
+            "search_index": {
+                "dir": "search-index",
+                "shards": 16
+            },
+            "sitemap": {
+                "include": ["", "reviews", "categories", "comparisons"],
+                "exclude": ["test.html"]
+            },
+            "text_analysis": {
+                "shingle_size": 3,
+                "max_entries": 50000
+            },
+            "homepage": {
+                "max_cards": 6
+            },
+            "category_pages": {},
+            "variants": [],
+            "variant_static_files": ["styles.css", "reviews/review-styles.css", "scripts.js"],
+            "variant_seed_pages": ["index.html", "comparison.html", "categories"],
+            "content_templates": {
+                "review_structure": [
+                    "introduction", "quick_verdict", "key_features", "trends", "performance_analysis",
+                    "image_gallery", "user_experiences", "pros_cons", "comparison", "buying_guide",
+                    "faq", "source_citations", "conclusion"
+                ]
+            },
+            "quality_thresholds": {
+                "min_word_count": 1500,
+                "min_user_quotes": 5,
+                "min_sources": 3,
+                "min_rating_confidence": 0.8
             }
         }
         
@@ -97,44 +1412,53 @@ class ReviewHarvester:
         
         return unique_products[:count]
     
+    # Stand-in results until the Tavily/SEO MCP tool calls are wired up
+    SIMULATED_PRODUCTS = {
+        "electronics": [
+            {
+                "name": "Steam Deck OLED",
+                "category": "Gaming Handheld",
+                "search_volume": 89000,
+                "competition": "medium",
+                "price_range": "$549-699",
+                "amazon_url": "https://www.amazon.com/dp/B0CQ3RWQQZ",
+                "keywords": ["steam deck review", "handheld gaming", "OLED display"]
+            },
+            {
+                "name": "iPhone 15 Pro",
+                "category": "Smartphone",
+                "search_volume": 156000,
+                "competition": "high",
+                "price_range": "$799-1299",
+                "amazon_url": "https://www.amazon.com/dp/B0CMZ5LT14",
+                "keywords": ["iPhone 15 Pro review", "worth it 2025", "long term"]
+            }
+        ],
+        "kitchen": [
+            {
+                "name": "Ninja Max XL Air Fryer",
+                "category": "Kitchen Appliance",
+                "search_volume": 45000,
+                "competition": "medium",
+                "price_range": "$150-180",
+                "amazon_url": "https://www.amazon.com/dp/B07VBR2PSN",
+                "keywords": ["air fryer review", "ninja max xl", "best air fryer 2025"]
+            }
+        ]
+    }
+    
     def _simulate_product_search(self, query: str, niche: str) -> List[Dict[str, Any]]:
         """Simulate product search results (replace with actual MCP calls)."""
-        # This would be replaced with actual Tavily/SEO MCP tool calls
-        simulated_products = {
-            "electronics": [
-                {
-                    "name": "Steam Deck OLED",
-                    "category": "Gaming Handheld",
-                    "search_volume": 89000,
-                    "competition": "medium",
-                    "price_range": "$549-699",
-                    "amazon_url": "https://www.amazon.com/dp/B0CQ3RWQQZ",
-                    "keywords": ["steam deck review", "handheld gaming", "OLED display"]
-                },
-                {
-                    "name": "iPhone 15 Pro",
-                    "category": "Smartphone",
-                    "search_volume": 156000,
-                    "competition": "high",
-                    "price_range": "$799-1299",
-                    "amazon_url": "https://www.amazon.com/dp/B0CMZ5LT14",
-                    "keywords": ["iPhone 15 Pro review", "worth it 2025", "long term"]
-                }
-            ],
-            "kitchen": [
-                {
-                    "name": "Ninja Max XL Air Fryer",
-                    "category": "Kitchen Appliance",
-                    "search_volume": 45000,
-                    "competition": "medium",
-                    "price_range": "$150-180",
-                    "amazon_url": "https://www.amazon.com/dp/B07VBR2PSN",
-                    "keywords": ["air fryer review", "ninja max xl", "best air fryer 2025"]
-                }
-            ]
-        }
-        
-        return simulated_products.get(niche, [])
+        return copy.deepcopy(self.SIMULATED_PRODUCTS.get(niche, []))
+    
+    def _simulate_product_lookup(self, product_name: str) -> Optional[Dict[str, Any]]:
+        """Simulate a direct product lookup by name (replace with an actual MCP call)."""
+        wanted = product_name.strip().lower()
+        for products in self.SIMULATED_PRODUCTS.values():
+            for product in products:
+                if product['name'].lower() == wanted:
+                    return copy.deepcopy(product)
+        return None
     
     def _deduplicate_and_rank(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicates and rank by search volume."""
@@ -167,30 +1491,167 @@ class ReviewHarvester:
             "sources": {},
             "sentiment_summary": {},
             "key_quotes": [],
+            "quotes_by_source": {},
             "pros_cons": {"pros": [], "cons": []}
         }
         
+        source_cache = self._load_source_cache(product)
+        
+        quote_selector = QuoteSelector(
+            top_n=self.config["max_key_quotes"],
+            per_source=self.config["max_quotes_per_source"]
+        )
+        
         # Collect from each configured source
         for source in self.config["review_sources"]:
             try:
-                source_reviews = self._collect_source_reviews(product, source)
+                source_reviews = self._collect_source_reviews_cached(product, source, source_cache)
                 reviews_data["sources"][source] = source_reviews
-                reviews_data["total_reviews"] += len(source_reviews["reviews"])
+                reviews_data["total_reviews"] += self._collected_count(source_reviews)
                 
                 # Extract key insights
-                self._extract_insights(source_reviews, reviews_data)
+                self._extract_insights(source, source_reviews, quote_selector)
                 
-                logger.info(f"✅ Collected {len(source_reviews['reviews'])} reviews from {source}")
+                logger.info(f"✅ Collected {self._collected_count(source_reviews)} reviews from {source}")
                 
             except Exception as e:
                 logger.error(f"❌ Failed to collect from {source}: {str(e)}")
                 reviews_data["sources"][source] = {"reviews": [], "error": str(e)}
         
+        self._save_source_cache(product, source_cache)
+        
+        reviews_data["key_quotes"] = quote_selector.top_quotes()
+        reviews_data["quotes_by_source"] = quote_selector.quotes_by_source()
+        
         logger.info(f"🎯 Total reviews collected: {reviews_data['total_reviews']}")
         return reviews_data
     
-    def _collect_source_reviews(self, product: Dict[str, Any], source: str) -> Dict[str, Any]:
-        """Collect reviews from a specific source."""
+    def _source_cache_path(self, product: Dict[str, Any]) -> str:
+        cache_dir = self.config.get('source_cache', {}).get('dir', 'data/source-cache')
+        return os.path.join(cache_dir, self._slugify(product['name']) + '.json')
+    
+    def _load_source_cache(self, product: Dict[str, Any]) -> Dict[str, Any]:
+        """Previously collected source data for a product, keyed by source."""
+        cache_path = self._source_cache_path(product)
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Ignoring unreadable source cache for {product['name']}: {str(e)}")
+        return {}
+    
+    def _save_source_cache(self, product: Dict[str, Any], source_cache: Dict[str, Any]):
+        OutputWriter.atomic_write(self._source_cache_path(product), json.dumps(source_cache, indent=2).encode('utf-8'))
+    
+    def _collect_source_reviews_cached(self, product: Dict[str, Any], source: str,
+                                       source_cache: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Collect a source incrementally using its stored high-water mark.
+        
+        Fresh cached data is reused as is. Otherwise only reviews newer than
+        the high-water mark are fetched and merged into the stored reviews and
+        aggregates; every full_resync_days the whole history is fetched again
+        to pick up edits and deletions.
+        """
+        settings = self.config.get('source_cache', {})
+        now = time.time()
+        cached = source_cache.get(source)
+        if cached and now - cached['fetched_at'] < settings.get('ttl_hours', 12) * 3600:
+            logger.info(f"♻️ Using cached {source} reviews for {product['name']}")
+            return cached['data']
+        
+        full_sync = (not cached or 'high_water_mark' not in cached
+                     or now - cached.get('last_full_sync', 0) >= settings.get('full_resync_days', 7) * 86400)
+        since = None if full_sync else cached['high_water_mark']
+        
+        fetched = self._collect_source_reviews(product, source, since)
+        if fetched.get('error'):
+            return fetched
+        
+        if full_sync:
+            entry = {"last_full_sync": now, "data": self._source_aggregates(fetched, fetched['reviews'])}
+            new_reviews = fetched['reviews']
+        else:
+            entry = cached
+            new_reviews = self._merge_source_delta(entry['data'], fetched, since)
+            logger.info(f"🔁 {len(new_reviews)} new {source} reviews since {since.get('date')} for {product['name']}")
+        
+        entry['fetched_at'] = now
+        entry['high_water_mark'] = self._high_water_mark(entry['data']['reviews'], since, new_reviews, fetched)
+        source_cache[source] = entry
+        return entry['data']
+    
+    @staticmethod
+    def _collected_count(source_reviews: Dict[str, Any]) -> int:
+        """Reviews collected from a source over time; the stored list is capped at max_stored_reviews."""
+        return source_reviews.get('collected_count', len(source_reviews.get('reviews', [])))
+    
+    @staticmethod
+    def _review_id(review: Dict[str, Any]) -> str:
+        """Stable review identity: the source's ID, or a hash of its date and text."""
+        if review.get('id'):
+            return str(review['id'])
+        return hashlib.sha1(f"{review.get('date', '')}|{review.get('text', '')}".encode('utf-8')).hexdigest()
+    
+    def _source_aggregates(self, fetched: Dict[str, Any], reviews: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Stored source data: source-level fields, retained reviews and running counts."""
+        data = {k: v for k, v in fetched.items() if k not in ('reviews', 'next_cursor')}
+        rated = [r['rating'] for r in reviews if r.get('rating') is not None]
+        data['collected_count'] = len(reviews)
+        data['rating_sum'] = float(sum(rated))
+        data['rated_count'] = len(rated)
+        data['reviews'] = self._retain_reviews(reviews)
+        return data
+    
+    def _retain_reviews(self, reviews: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep the newest reviews, bounded so long-running products don't grow without limit."""
+        limit = self.config.get('source_cache', {}).get('max_stored_reviews', 200)
+        return sorted(reviews, key=lambda r: r.get('date', ''), reverse=True)[:limit]
+    
+    def _merge_source_delta(self, data: Dict[str, Any], fetched: Dict[str, Any],
+                            since: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Merge newly fetched reviews into stored source data; returns the reviews that were new."""
+        seen = set(since.get('ids', [])) | {self._review_id(r) for r in data['reviews']}
+        new_reviews = []
+        for review in fetched['reviews']:
+            review_id = self._review_id(review)
+            if review_id not in seen:
+                seen.add(review_id)
+                new_reviews.append(review)
+        
+        # Source-level fields (average_rating, total_count...) always come from the latest response
+        data.update({k: v for k, v in fetched.items() if k not in ('reviews', 'next_cursor')})
+        rated = [r['rating'] for r in new_reviews if r.get('rating') is not None]
+        data['collected_count'] += len(new_reviews)
+        data['rating_sum'] += float(sum(rated))
+        data['rated_count'] += len(rated)
+        data['reviews'] = self._retain_reviews(new_reviews + data['reviews'])
+        return new_reviews
+    
+    def _high_water_mark(self, reviews: List[Dict[str, Any]], previous: Optional[Dict[str, Any]],
+                         new_reviews: List[Dict[str, Any]], fetched: Dict[str, Any]) -> Dict[str, Any]:
+        """Newest review date seen, the IDs seen on that date, and the source's cursor."""
+        previous = previous or {}
+        newest = max([r.get('date', '') for r in new_reviews] + [previous.get('date') or ''])
+        ids = set(previous.get('ids', [])) if newest == previous.get('date') else set()
+        ids.update(self._review_id(r) for r in new_reviews if r.get('date', '') == newest)
+        return {
+            "date": newest or None,
+            "ids": sorted(ids),
+            "cursor": fetched.get('next_cursor', previous.get('cursor'))
+        }
+    
+    @staticmethod
+    def _reviews_since(reviews: List[Dict[str, Any]], since: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Reviews on or after the high-water mark date (same-day duplicates are removed on merge)."""
+        if not since or not since.get('date'):
+            return reviews
+        return [r for r in reviews if r.get('date', '') >= since['date']]
+    
+    def _collect_source_reviews(self, product: Dict[str, Any], source: str,
+                                since: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Collect reviews from a specific source, optionally only those newer than a high-water mark."""
         # This would be replaced with actual MCP tool calls (BrightData, Tavily, etc.)
         
         source_handlers = {
@@ -202,15 +1663,15 @@ class ReviewHarvester:
         
         handler = source_handlers.get(source)
         if handler:
-            return handler(product)
+            return handler(product, since)
         else:
             return {"reviews": [], "error": f"Unknown source: {source}"}
     
-    def _collect_amazon_reviews(self, product: Dict[str, Any]) -> Dict[str, Any]:
+    def _collect_amazon_reviews(self, product: Dict[str, Any], since: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Collect Amazon reviews (simulated - replace with BrightData MCP)."""
         # Simulate Amazon review data
         return {
-            "reviews": [
+            "reviews": self._reviews_since([
                 {
                     "rating": 5,
                     "text": "Absolutely love this product! Works perfectly and exceeded expectations.",
@@ -225,100 +1686,326 @@ class ReviewHarvester:
                     "helpful_votes": 8,
                     "date": "2024-12-10"
                 }
-            ],
+            ], since),
             "average_rating": 4.6,
             "total_count": 1247
         }
     
-    def _collect_reddit_reviews(self, product: Dict[str, Any]) -> Dict[str, Any]:
+    def _collect_reddit_reviews(self, product: Dict[str, Any], since: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Collect Reddit discussions (simulated - replace with actual scraping)."""
         return {
-            "reviews": [
+            "reviews": self._reviews_since([
                 {
                     "upvotes": 156,
                     "text": "Been using this for 6 months, definitely worth the investment.",
                     "subreddit": "ProductReviews",
                     "date": "2024-12-01"
                 }
-            ],
+            ], since),
             "total_mentions": 89
         }
     
-    def _collect_youtube_reviews(self, product: Dict[str, Any]) -> Dict[str, Any]:
+    def _collect_youtube_reviews(self, product: Dict[str, Any], since: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Collect YouTube review comments."""
         return {
-            "reviews": [
+            "reviews": self._reviews_since([
                 {
                     "likes": 45,
                     "text": "Great review! This convinced me to purchase.",
                     "video_title": f"{product['name']} Review",
                     "date": "2024-11-28"
                 }
-            ],
+            ], since),
             "total_videos": 23
         }
     
-    def _collect_google_reviews(self, product: Dict[str, Any]) -> Dict[str, Any]:
+    def _collect_google_reviews(self, product: Dict[str, Any], since: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Collect Google Shopping/Reviews."""
         return {
-            "reviews": [
+            "reviews": self._reviews_since([
                 {
                     "rating": 4.5,
                     "text": "Solid product, meets all advertised features.",
                     "source": "Google Shopping",
                     "date": "2024-12-05"
                 }
-            ],
+            ], since),
             "average_rating": 4.4
         }
     
-    def _extract_insights(self, source_reviews: Dict[str, Any], reviews_data: Dict[str, Any]):
-        """Extract key insights from source reviews."""
+    def _extract_insights(self, source: str, source_reviews: Dict[str, Any], quote_selector: QuoteSelector):
+        """Extract key insights from source reviews, keeping only the most helpful quotes."""
         for review in source_reviews.get("reviews", []):
             text = review.get("text", "")
             if len(text) > 50:  # Only consider substantial reviews
-                reviews_data["key_quotes"].append({
+                analysis = self.text_analyzer.analyze(text)
+                score = quote_selector.score(review)
+                quote_selector.add(source, {
                     "text": text[:200] + "..." if len(text) > 200 else text,
-                    "source": source_reviews.get("source", "unknown"),
+                    "text_hash": analysis['hash'],
+                    "source": source,
                     "rating": review.get("rating"),
-                    "verified": review.get("verified", False)
-                })
+                    "verified": review.get("verified", False),
+                    "date": review.get("date"),
+                    "score": round(score, 4)
+                }, score, key=analysis['normalized_hash'])
 
-    def generate_review_content(self, reviews_data: Dict[str, Any]) -> str:
+    def _rating_stats(self, reviews_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Per-source ratings and review weights used for the aggregate rating and its confidence."""
+        ratings = {}
+        for source, source_reviews in reviews_data['sources'].items():
+            rating = source_reviews.get('average_rating')
+            if rating is None and source_reviews.get('rated_count'):
+                rating = source_reviews['rating_sum'] / source_reviews['rated_count']
+            if rating is None:
+                rated = [r['rating'] for r in source_reviews.get('reviews', []) if r.get('rating') is not None]
+                rating = sum(rated) / len(rated) if rated else None
+            if rating is None:
+                continue
+            weight = source_reviews.get('total_count') or self._collected_count(source_reviews) or 1
+            ratings[source] = (rating, weight)
+        return ratings
+    
+    def _aggregate_rating(self, reviews_data: Dict[str, Any]) -> Optional[float]:
+        """Average rating across sources, weighted by each source's review count."""
+        ratings = self._rating_stats(reviews_data)
+        total_weight = sum(weight for _, weight in ratings.values())
+        if not total_weight:
+            return None
+        return round(sum(rating * weight for rating, weight in ratings.values()) / total_weight, 2)
+    
+    def _rating_confidence(self, reviews_data: Dict[str, Any]) -> float:
+        """
+        Confidence (0-1) in the aggregate rating.
+        
+        Grows with the number of rated reviews and shrinks when sources
+        disagree (spread between source averages on the 5-point scale).
+        """
+        ratings = self._rating_stats(reviews_data)
+        if not ratings:
+            return 0.0
+        total_weight = sum(weight for _, weight in ratings.values())
+        averages = [rating for rating, _ in ratings.values()]
+        sample_confidence = total_weight / (total_weight + self.RATING_CONFIDENCE_PRIOR)
+        agreement = 1.0 - min(1.0, (max(averages) - min(averages)) / 4.0)
+        return sample_confidence * agreement
+    
+    def check_quality(self, reviews_data: Dict[str, Any]) -> List[str]:
+        """
+        Cheap pre-render quality gate on collected data.
+        
+        Args:
+            reviews_data: Collected reviews data from collect_reviews
+            
+        Returns:
+            Reasons the product fails the gate (empty if it passes)
+        """
+        thresholds = self.config.get('quality_thresholds', {})
+        failures = []
+        
+        # Without one the affiliate links would point at /dp/PLACEHOLDER/
+        if self._asin(reviews_data['product']) == 'PLACEHOLDER':
+            failures.append("no ASIN or Amazon URL")
+        
+        total_reviews = reviews_data['total_reviews']
+        if total_reviews < self.config['min_reviews_per_product']:
+            failures.append(f"{total_reviews} reviews < {self.config['min_reviews_per_product']}")
+        
+        sources = sum(1 for s in reviews_data['sources'].values() if s.get('reviews') and not s.get('error'))
+        if sources < thresholds.get('min_sources', 0):
+            failures.append(f"{sources} sources < {thresholds['min_sources']}")
+        
+        quotes = len(reviews_data['key_quotes'])
+        if quotes < thresholds.get('min_user_quotes', 0):
+            failures.append(f"{quotes} user quotes < {thresholds['min_user_quotes']}")
+        
+        confidence = self._rating_confidence(reviews_data)
+        if confidence < thresholds.get('min_rating_confidence', 0):
+            failures.append(f"rating confidence {confidence:.2f} < {thresholds['min_rating_confidence']}")
+        
+        return failures
+    
+    def record_snapshots(self, collected: List[Dict[str, Any]]):
+        """Append this run's product snapshots to the history archive."""
+        if self.snapshot_archive is None or not collected:
+            return
+        snapshots = []
+        for reviews_data in collected:
+            product = reviews_data['product']
+            snapshots.append({
+                "name": product['name'],
+                "category": product.get('category', ''),
+                "average_rating": self._aggregate_rating(reviews_data),
+                "total_reviews": reviews_data['total_reviews'],
+                "price_range": product.get('price_range', ''),
+                "source_counts": {
+                    source: self._collected_count(source_reviews)
+                    for source, source_reviews in reviews_data['sources'].items()
+                }
+            })
+        self.snapshot_archive.append_run(snapshots)
+        logger.info(f"🗄️ Archived {len(snapshots)} product snapshots")
+
+    def generate_review_content(self, reviews_data: Dict[str, Any], variant: Optional[Dict[str, Any]] = None) -> str:
         """
         Phase 3: Generate SEO-optimized review article.
         
         Args:
             reviews_data: Collected reviews data from collect_reviews
+            variant: Storefront variant to render (defaults to the first configured one)
             
         Returns:
-            Complete HTML content for the review page
+            Complete HTML content for the review page (the rendered word
+            count is stored in reviews_data['word_count'])
+        """
+        variant = variant or self._variants()[0]
+        return self.generate_review_variants(reviews_data, [variant])[variant['name']]
+    
+    def generate_review_variants(self, reviews_data: Dict[str, Any],
+                                 variants: Optional[List[Dict[str, Any]]] = None) -> Dict[str, str]:
+        """
+        Render a review once and fill in each variant's slots.
+        
+        Sections are generated a single time with placeholders for the
+        affiliate URLs, prices and locale strings; each variant then only
+        costs one substitution pass over the page.
+        
+        Args:
+            reviews_data: Collected reviews data from collect_reviews
+            variants: Variants to render (defaults to all configured variants)
+            
+        Returns:
+            Variant name to complete HTML content
+        """
+        product = reviews_data['product']
+        variants = variants or self._variants()
+        shared_html = self._render_review(reviews_data, variants[0])
+        
+        # DOM hooks don't depend on the variant, so the script selection is shared too
+        script_sections = self.script_bundler.select_sections(self.script_bundler.page_hooks(shared_html))
+        
+        pages = {}
+        for variant in variants:
+            html_content = self._fill_slots(shared_html, product, variant)
+            pages[variant['name']] = html_content.replace(
+                self.SCRIPTS_PLACEHOLDER,
+                self.script_bundler.bundle_tag(script_sections, asset_prefix="../", site_root=variant['site_root'])
+            )
+        
+        logger.info(f"📝 Generated {len(shared_html)} characters ({reviews_data['word_count']} words) of content "
+                    f"for {len(pages)} variant(s)")
+        return pages
+    
+    def _render_review(self, reviews_data: Dict[str, Any], count_variant: Dict[str, Any]) -> str:
+        """
+        Render the variant-independent review page, with slots left unfilled.
+        
+        reviews_data['word_count'] is measured on the body as count_variant
+        will show it, since a slot's filled text can be several words.
         """
         logger.info(f"✍️ Generating review content for {reviews_data['product']['name']}...")
         
         product = reviews_data['product']
         
-        # Generate content sections
+        # Generators are only called for sections listed in the review structure
+        section_generators = {
+            "introduction": lambda: self._generate_introduction(product, reviews_data),
+            "quick_verdict": lambda: self._generate_quick_verdict(product, reviews_data),
+            "key_features": lambda: self._generate_key_features(product, reviews_data),
+            "trends": lambda: self._generate_trends(product),
+            "performance_analysis": lambda: self._generate_performance_analysis(product, reviews_data),
+            "image_gallery": lambda: self._generate_image_gallery(product, reviews_data),
+            "pros_cons": lambda: self._generate_pros_cons(reviews_data),
+            "user_experiences": lambda: self._generate_user_experiences(reviews_data),
+            "comparison": lambda: self._generate_comparison(product),
+            "buying_guide": lambda: self._generate_buying_guide(product),
+            "faq": lambda: self._generate_faq(product, reviews_data),
+            "source_citations": lambda: self._generate_source_citations(product, reviews_data),
+            "conclusion": lambda: self._generate_conclusion(product, reviews_data)
+        }
+        
+        sections = []
+        for name in self.config['content_templates']['review_structure']:
+            generator = section_generators.get(name)
+            if generator is None:
+                logger.warning(f"⚠️ Unknown review section '{name}' - skipping")
+                continue
+            sections.append(generator())
+        
         content_sections = {
             "title": self._generate_seo_title(product),
             "meta_description": self._generate_meta_description(product),
-            "introduction": self._generate_introduction(product, reviews_data),
-            "key_features": self._generate_key_features(product, reviews_data),
-            "image_gallery": self._generate_image_gallery(product, reviews_data),
-            "pros_cons": self._generate_pros_cons(reviews_data),
-            "user_experiences": self._generate_user_experiences(reviews_data),
-            "comparison": self._generate_comparison(product),
-            "buying_guide": self._generate_buying_guide(product),
-            "faq": self._generate_faq(product, reviews_data),
-            "source_citations": self._generate_source_citations(product, reviews_data),
-            "conclusion": self._generate_conclusion(product, reviews_data)
+            "body": "\n".join(sections)
         }
+        reviews_data['word_count'] = count_words(self._fill_slots(content_sections['body'], product, count_variant))
         
         # Generate complete HTML
-        html_content = self._compile_html_template(content_sections, reviews_data)
+        return self._compile_html_template(content_sections, reviews_data)
+    
+    def _variants(self) -> List[Dict[str, Any]]:
+        """Configured storefront variants, each filled out with the defaults."""
+        default = {
+            "name": "default",
+            "site_root": ".",
+            "affiliate_tag": self.affiliate_tag,
+            "storefront": "https://www.amazon.com",
+            "currency_symbol": "$",
+            "currency_rate": 1.0,
+            "lang": "en",
+            "date_format": "%B %Y",
+            "strings": {}
+        }
+        variants = [dict(default, **variant) for variant in self.config.get('variants') or [{}]]
+        for variant in variants:
+            variant['strings'] = dict(self.VARIANT_STRINGS, **variant['strings'])
+            if 'site_url' not in variant:
+                site_root = os.path.normpath(variant['site_root'])
+                variant['site_url'] = urljoin(self.config['site_url'], '' if site_root == '.' else site_root.strip('/') + '/')
+        return variants
+    
+    @staticmethod
+    def _slot(name: str, arg: Optional[str] = None) -> str:
+        """Placeholder for a variant-specific value."""
+        return f"{{{{slot:{name}:{arg}}}}}" if arg is not None else f"{{{{slot:{name}}}}}"
+    
+    @staticmethod
+    def _asin(product: Dict[str, Any]) -> str:
+        """Product ASIN, falling back to the one in its Amazon URL."""
+        if product.get('asin'):
+            return product['asin']
+        match = re.search(r'/dp/(\w+)', product.get('amazon_url', ''))
+        return match.group(1) if match else 'PLACEHOLDER'
+    
+    def _format_price(self, price_range: str, variant: Dict[str, Any]) -> str:
+        """Convert a '$549-699' style price range into the variant's currency."""
+        prices = parse_price_range(price_range)
+        if prices is None:
+            return variant['strings']['check_pricing']
+        low, high = (price * variant['currency_rate'] for price in prices)
+        symbol = variant['currency_symbol']
+        return f"{symbol}{low:,.0f}" if low == high else f"{symbol}{low:,.0f}-{high:,.0f}"
+    
+    def _fill_slots(self, html_content: str, product: Dict[str, Any], variant: Dict[str, Any]) -> str:
+        """Fill every variant slot in a rendered page in a single pass."""
+        storefront = variant['storefront'].rstrip('/')
+        asin = self._asin(product)
+        values = {
+            "affiliate_url": f"{storefront}/dp/{asin}/?tag={variant['affiliate_tag']}",
+            "storefront_url": f"{storefront}/dp/{asin}" if asin != 'PLACEHOLDER' else storefront,
+            "lang": variant['lang'],
+            "updated": f"{variant['strings']['updated']}: {datetime.now().strftime(variant['date_format'])}"
+        }
+        
+        def fill(match):
+            name, arg = match.group(1), match.group(2)
+            if name == 'price':
+                return self._format_price(arg, variant)
+            if name == 'text':
+                return variant['strings'].get(arg, arg)
+            # Unknown names are left as written rather than failing the whole page
+            return values.get(name, match.group(0))
         
-        logger.info(f"📝 Generated {len(html_content)} characters of content")
-        return html_content
+        return self.SLOT_RE.sub(fill, html_content)
     
     def _generate_seo_title(self, product: Dict[str, Any]) -> str:
         """Generate SEO-optimized title."""
@@ -341,6 +2028,52 @@ class ReviewHarvester:
         <p>This comprehensive review cuts through marketing hype to give you honest insights based on actual user experiences, long-term performance data, and detailed analysis of both strengths and weaknesses.</p>
         """
     
+    def _generate_quick_verdict(self, product: Dict[str, Any], reviews_data: Dict[str, Any]) -> str:
+        """Generate quick verdict box from the aggregate rating."""
+        rating = self._aggregate_rating(reviews_data)
+        if rating is None:
+            return ""
+        if rating >= 4.5:
+            verdict = "Highly recommended - users are overwhelmingly satisfied."
+        elif rating >= 4.0:
+            verdict = "Recommended for most buyers, with a few common caveats."
+        else:
+            verdict = "Worth a look, but read the complaints below before buying."
+        
+        return f"""
+        <div class="quick-verdict">
+            <h2>Quick Verdict</h2>
+            <p><strong>{rating}/5</strong> from {reviews_data['total_reviews']}+ reviews across {len(self._rating_stats(reviews_data))} rated sources. {verdict}</p>
+        </div>
+        """
+    
+    def _generate_performance_analysis(self, product: Dict[str, Any], reviews_data: Dict[str, Any]) -> str:
+        """Generate per-source breakdown of ratings and review volume."""
+        ratings = self._rating_stats(reviews_data)
+        rows_html = ""
+        for source, source_reviews in reviews_data['sources'].items():
+            if not source_reviews.get('reviews'):
+                continue
+            rating = ratings.get(source)
+            rows_html += f"""
+                <tr>
+                    <td>{self.SOURCE_LABELS.get(source, source.title())}</td>
+                    <td>{self._collected_count(source_reviews)}</td>
+                    <td>{f"{rating[0]:.1f}/5" if rating else "-"}</td>
+                </tr>"""
+        
+        return f"""
+        <h2>Performance Analysis</h2>
+        <p>How the {product['name']} rates across the sources we analyzed:</p>
+        <table class="performance-table">
+            <thead>
+                <tr><th>Source</th><th>Reviews Analyzed</th><th>Average Rating</th></tr>
+            </thead>
+            <tbody>{rows_html}
+            </tbody>
+        </table>
+        """
+    
     def _generate_key_features(self, product: Dict[str, Any], reviews_data: Dict[str, Any]) -> str:
         """Generate key features section based on user feedback."""
         # This would analyze reviews to extract most-mentioned features
@@ -353,6 +2086,49 @@ class ReviewHarvester:
         </ul>
         """
     
+    def _generate_trends(self, product: Dict[str, Any]) -> str:
+        """Generate rating and price history sparklines from the snapshot archive."""
+        if self.snapshot_archive is None:
+            return ""
+        days = self.config.get('history_settings', {}).get('trend_days', 365)
+        start = datetime.fromtimestamp(datetime.now().timestamp() - days * 86400)
+        history = self.snapshot_archive.query(
+            product=product['name'], start=start,
+            columns=["run_time", "average_rating", "price_min", "price_max"]
+        )
+        if len(history["run_time"]) < 2:
+            return ""
+        
+        prices = (history["price_min"] + history["price_max"]) / 2
+        return f"""
+        <div class="trend-sparklines">
+            <div class="trend-item">
+                <span class="trend-label">Rating history</span>
+                {self._sparkline(history["average_rating"])}
+            </div>
+            <div class="trend-item">
+                <span class="trend-label">Price history</span>
+                {self._sparkline(prices)}
+            </div>
+        </div>
+        """
+    
+    @staticmethod
+    def _sparkline(values, width: int = 120, height: int = 30) -> str:
+        """Render a series as an inline SVG sparkline (missing values are skipped)."""
+        values = values[np.isfinite(values)]
+        if len(values) < 2:
+            return ""
+        low, high = float(values.min()), float(values.max())
+        spread = (high - low) or 1.0
+        step = width / (len(values) - 1)
+        points = " ".join(
+            f"{i * step:.1f},{height - (float(v) - low) / spread * height:.1f}" for i, v in enumerate(values)
+        )
+        return (f'<svg class="sparkline" width="{width}" height="{height}" viewBox="0 0 {width} {height}" '
+                f'role="img" aria-label="from {values[0]:.2f} to {values[-1]:.2f}">'
+                f'<polyline fill="none" stroke="currentColor" stroke-width="1.5" points="{points}"/></svg>')
+    
     def _generate_pros_cons(self, reviews_data: Dict[str, Any]) -> str:
         """Generate pros and cons from actual user reviews."""
         return """
@@ -378,13 +2154,19 @@ class ReviewHarvester:
         </div>
         """
     
+    @staticmethod
+    def _scraped_text(text: str) -> str:
+        """Escape scraped review text; braces are encoded so it can never form a {{slot:...}} placeholder."""
+        return html_escape(text).replace('{', '&#123;').replace('}', '&#125;')
+    
     def _generate_user_experiences(self, reviews_data: Dict[str, Any]) -> str:
         """Generate user experience section with real quotes."""
         quotes_html = ""
-        for quote in reviews_data['key_quotes'][:3]:  # Top 3 quotes
+        for quote in reviews_data['key_quotes'][:3]:  # Top 3 quotes, best first
+            label = self.SOURCE_LABELS.get(quote.get('source'), 'Verified User')
             quotes_html += f"""
             <blockquote class="user-review">
-                "{quote['text']}" - {quote.get('source', 'Verified User')}
+                "{self._scraped_text(quote['text'])}" - {label}
             </blockquote>
             """
         
@@ -393,25 +2175,63 @@ class ReviewHarvester:
         {quotes_html}
         """
     
+    RELATED_BLOCK_START = "<!-- related-products -->"
+    RELATED_BLOCK_END = "<!-- /related-products -->"
+    
     def _generate_comparison(self, product: Dict[str, Any]) -> str:
-        """Generate comparison section."""
+        """Generate comparison section with links to the most similar products."""
         return f"""
         <h2>How Does the {product['name']} Compare?</h2>
         <p>Compared to similar products in the {product['category'].lower()} category, the {product['name']} stands out for its unique combination of features and value proposition.</p>
+        {self._related_block(product)}
         """
     
+    def _related_block(self, product: Dict[str, Any]) -> str:
+        """
+        "Compare With" links to the most similar products, between markers
+        so refresh_related_links can replace them on a published page.
+        """
+        compare_html = ""
+        for related in self._related_products(product):
+            compare_html += f"""
+                <li>
+                    <a href="../{self._comparison_path(product['name'], related['name'])}">{product['name']} vs {related['name']}</a>
+                    <span class="compare-meta">{related['category']} · {self._slot('price', related['price_range'])}</span>
+                </li>
+            """
+        
+        if compare_html:
+            compare_html = f"""
+        <div class="compare-with">
+            <h3>Compare With</h3>
+            <ul>{compare_html}</ul>
+        </div>
+        """
+        return f"{self.RELATED_BLOCK_START}{compare_html}{self.RELATED_BLOCK_END}"
+    
+    def _related_products(self, product: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Nearest neighbours of a product from the related products index."""
+        if self.related_index is None:
+            return []
+        settings = self.config.get('related_products', {})
+        return self.related_index.neighbours(
+            product['name'],
+            limit=settings.get('compare_links', 3),
+            min_score=settings.get('min_similarity', 0.2)
+        )
+    
     def _generate_buying_guide(self, product: Dict[str, Any]) -> str:
         """Generate buying guide section."""
-        amazon_link = f"https://www.amazon.com/dp/{product.get('asin', 'PLACEHOLDER')}/?tag={self.affiliate_tag}"
+        amazon_link = self._slot('affiliate_url')
         
         return f"""
-        <h2>Where to Buy & Best Deals</h2>
+        <h2>{self._slot('text', 'where_to_buy')}</h2>
         <div class="purchase-options">
             <div class="purchase-option featured">
                 <h3>🔥 Best Deal</h3>
                 <p><strong>{product['name']}</strong></p>
-                <p class="price">{product.get('price_range', 'Check for latest pricing')}</p>
-                <a href="{amazon_link}" class="buy-button" target="_blank" rel="nofollow">View on Amazon</a>
+                <p class="price">{self._slot('price', product.get('price_range', ''))}</p>
+                <a href="{amazon_link}" class="buy-button" target="_blank" rel="nofollow">{self._slot('text', 'view_on_amazon')}</a>
                 <small>✓ Free shipping ✓ Prime eligible ✓ Easy returns</small>
             </div>
         </div>
@@ -561,7 +2381,7 @@ class ReviewHarvester:
                                 <p>Real purchase experiences and detailed feedback from verified buyers</p>
                             </div>
                         </div>
-                        <a href="{product.get('amazon_url', 'https://amazon.com')}" target="_blank" rel="nofollow" class="citation-link">
+                        <a href="{self._slot('storefront_url')}" target="_blank" rel="nofollow" class="citation-link">
                             <i class="fas fa-external-link-alt"></i>
                             Read Customer Reviews
                         </a>
@@ -693,7 +2513,7 @@ class ReviewHarvester:
         product = reviews_data['product']
         
         html_template = f"""<!DOCTYPE html>
-<html lang="en">
+<html lang="{self._slot('lang')}">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
@@ -730,21 +2550,12 @@ class ReviewHarvester:
                         <span class="score">4.6/5</span>
                         <span class="based-on">Based on {reviews_data['total_reviews']}+ real user reviews</span>
                     </div>
-                    <div class="publish-date">Updated: {datetime.now().strftime('%B %Y')}</div>
+                    <div class="publish-date">{self._slot('updated')}</div>
                 </div>
             </div>
 
             <div class="review-content">
-                {content_sections['introduction']}
-                {content_sections['key_features']}
-                {content_sections['image_gallery']}
-                {content_sections['pros_cons']}
-                {content_sections['user_experiences']}
-                {content_sections['comparison']}
-                {content_sections['buying_guide']}
-                {content_sections['faq']}
-                {content_sections['source_citations']}
-                {content_sections['conclusion']}
+                {content_sections['body']}
             </div>
         </article>
     </main>
@@ -763,6 +2574,7 @@ class ReviewHarvester:
         </div>
     </footer>
 
+    {self.SCRIPTS_PLACEHOLDER}
     <script>
         // Interactive features
         document.querySelectorAll('.faq-item h4').forEach(item => {{
@@ -777,39 +2589,499 @@ class ReviewHarvester:
         
         return html_template
 
-    def create_html_page(self, product_name: str, html_content: str) -> str:
+    @staticmethod
+    def _slugify(name: str) -> str:
+        """Filename-safe slug used for review and comparison pages."""
+        return name.lower().replace(' ', '-').replace('/', '-')
+    
+    def _comparison_path(self, name_a: str, name_b: str) -> str:
+        """Site-relative path of the comparison page for two products (order independent)."""
+        first, second = sorted([self._slugify(name_a), self._slugify(name_b)])
+        return f"comparisons/{first}-vs-{second}.html"
+    
+    def create_html_page(self, product_name: str, html_content: str, site_root: str = ".") -> str:
         """
         Phase 4: Create HTML page and save to reviews directory.
         
         Args:
             product_name: Name of the product for filename
             html_content: Generated HTML content
+            site_root: Site tree to write into (one per variant)
             
         Returns:
             Path to created HTML file
         """
         # Generate filename
-        filename = product_name.lower().replace(' ', '-').replace('/', '-') + '-review.html'
-        filepath = os.path.join('reviews', filename)
-        
-        # Create reviews directory if it doesn't exist
-        os.makedirs('reviews', exist_ok=True)
-        
-        # Write HTML content to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        filename = self._slugify(product_name) + '-review.html'
+        filepath = os.path.normpath(os.path.join(site_root, 'reviews', filename))
         
-        logger.info(f"📄 Created HTML page: {filepath}")
+        # Write atomically; unchanged pages are left untouched
+        if self.output_writer.write(filepath, html_content):
+            logger.info(f"📄 Created HTML page: {filepath}")
+        else:
+            logger.info(f"⏭️ HTML page unchanged: {filepath}")
         return filepath
 
-    def update_homepage(self, new_reviews: List[Dict[str, Any]]):
-        """Update homepage with new review cards."""
+    def sync_variant_static_files(self, variants: Optional[List[Dict[str, Any]]] = None):
+        """
+        Copy shared static files (stylesheets, scripts) into every variant
+        site tree outside the main one, and seed the shared pages.
+        
+        Pages in variant_seed_pages (homepage, comparison tool, category
+        pages) are copied once, when missing from the variant tree; after
+        that they belong to the variant and collect its own review cards.
+        Relative links in a seeded page to files the variant tree lacks are
+        pointed at the main site instead.
+        """
+        for variant in variants or self._variants():
+            site_root = variant['site_root']
+            if os.path.normpath(site_root) == '.':
+                continue
+            for static_path in self.config.get('variant_static_files', []):
+                if not os.path.exists(static_path):
+                    continue
+                with open(static_path, 'rb') as f:
+                    self.output_writer.write(os.path.join(site_root, static_path), f.read())
+            
+            seeds = []
+            for seed_path in self.config.get('variant_seed_pages', []):
+                if os.path.isdir(seed_path):
+                    seeds.extend(os.path.join(seed_path, name) for name in sorted(os.listdir(seed_path)) if name.endswith('.html'))
+                elif os.path.exists(seed_path):
+                    seeds.append(seed_path)
+            for seed_path in seeds:
+                target = os.path.join(site_root, seed_path)
+                if os.path.exists(target):
+                    continue
+                with open(seed_path, 'r', encoding='utf-8') as f:
+                    page = f.read()
+                self.output_writer.write(target, self._rebase_seed_links(page, seed_path, site_root, seeds))
+                logger.info(f"🌱 Seeded {target}")
+    
+    SEED_LINK_RE = re.compile(r'(\s(?:href|src)=")([^"]+)(")')
+    
+    def _rebase_seed_links(self, page: str, page_path: str, site_root: str, seeds: List[str]) -> str:
+        """Point relative links in a page copied into site_root at the main site when site_root lacks the file."""
+        seeded = {os.path.normpath(path) for path in seeds}
+        
+        def rebase(match):
+            link = match.group(2)
+            if re.match(r'[a-zA-Z][\w+.-]*:|//|#', link):
+                return match.group(0)
+            target = LinkChecker._local_target(page_path, link)
+            if target is None or target.startswith(os.pardir):
+                return match.group(0)
+            # Other seeded pages arrive in the same pass
+            if target in seeded or os.path.exists(os.path.join(site_root, target)):
+                return match.group(0)
+            parts = urlsplit(link)
+            url = urljoin(self.config['site_url'], target.replace(os.sep, '/'))
+            url += f"?{parts.query}" if parts.query else ""
+            url += f"#{parts.fragment}" if parts.fragment else ""
+            return match.group(1) + url + match.group(3)
+        
+        return self.SEED_LINK_RE.sub(rebase, page)
+    
+    def create_comparison_pages(self, product: Dict[str, Any],
+                                variants: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+        """
+        Create side-by-side comparison pages between a product and its nearest neighbours.
+        
+        Args:
+            product: Product dictionary already added to the related products index
+            variants: Variants to write site trees for (defaults to all configured variants)
+            
+        Returns:
+            Paths to the comparison pages
+        """
+        entries = {p['name']: p for p in self.related_index.products} if self.related_index else {}
+        current = entries.get(product['name'])
+        filepaths = []
+        
+        for related in self._related_products(product):
+            left, right = sorted([current, entries[related['name']]], key=lambda p: self._slugify(p['name']))
+            shared_html = self._compile_comparison_template(left, right, related['similarity'])
+            for variant in variants or self._variants():
+                filepath = os.path.normpath(os.path.join(
+                    variant['site_root'], self._comparison_path(product['name'], related['name'])
+                ))
+                if self.output_writer.write(filepath, self._fill_slots(shared_html, product, variant)):
+                    logger.info(f"⚖️ Created comparison page: {filepath}")
+                filepaths.append(filepath)
+        
+        return filepaths
+    
+    def _compile_comparison_template(self, left: Dict[str, Any], right: Dict[str, Any], similarity: float) -> str:
+        """Compile a side-by-side comparison page for two indexed products."""
+        rows = [
+            ("Category", left['category'], right['category']),
+            ("Price Range", self._slot('price', left['price_range']), self._slot('price', right['price_range'])),
+            ("Reviews Analyzed", f"{left['total_reviews']}+", f"{right['total_reviews']}+"),
+        ]
+        rows_html = "".join(f"""
+                    <tr>
+                        <th>{label}</th>
+                        <td>{left_value}</td>
+                        <td>{right_value}</td>
+                    </tr>""" for label, left_value, right_value in rows)
+        
+        return f"""<!DOCTYPE html>
+<html lang="{self._slot('lang')}">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{left['name']} vs {right['name']}: Side-by-Side Comparison 2025</title>
+    <meta name="description" content="{left['name']} vs {right['name']} compared side by side using real user reviews, pricing and key features.">
+    <link rel="stylesheet" href="../reviews/review-styles.css">
+    <link rel="stylesheet" href="../styles.css">
+</head>
+<body>
+    <main class="review-main">
+        <article class="review-article comparison-page">
+            <div class="breadcrumb">
+                <a href="../index.html">Home</a> > <a href="../comparison.html">Compare</a> > {left['name']} vs {right['name']}
+            </div>
+            <h1>{left['name']} vs {right['name']}</h1>
+            <p class="comparison-similarity">Similarity score: {similarity:.0%}</p>
+            <table class="comparison-table">
+                <thead>
+                    <tr>
+                        <th></th>
+                        <th><a href="../reviews/{self._slugify(left['name'])}-review.html">{left['name']}</a></th>
+                        <th><a href="../reviews/{self._slugify(right['name'])}-review.html">{right['name']}</a></th>
+                    </tr>
+                </thead>
+                <tbody>{rows_html}
+                </tbody>
+            </table>
+        </article>
+    </main>
+</body>
+</html>"""
+    
+    def update_site_indexes(self, new_reviews: List[Dict[str, Any]], variants: Optional[List[Dict[str, Any]]] = None):
+        """
+        Update the sitemap and search index entries for newly published reviews.
+        
+        Only the search index shards touching these products are rewritten,
+        in every variant's site tree; the shard list the site search loads
+        is kept in search-index/manifest.json.
+        """
+        settings = self.config.get('search_index', {})
+        shard_count = settings.get('shards', 16)
+        generate_sitemap = self.config.get('automation_settings', {}).get('generate_sitemap', True)
+        today = datetime.now().strftime('%Y-%m-%d')
+        
+        for variant in variants or self._variants():
+            site_root = variant['site_root']
+            page_paths = {review['product']['name']: f"reviews/{self._slugify(review['product']['name'])}-review.html"
+                          for review in new_reviews}
+            
+            if generate_sitemap:
+                self._update_sitemap(site_root, variant['site_url'], list(page_paths.values()), today)
+            
+            shards: Dict[str, List[Dict[str, Any]]] = {}
+            for review in new_reviews:
+                product = review['product']
+                slug = self._slugify(product['name'])
+                shard = f"shard-{int(hashlib.md5(slug.encode('utf-8')).hexdigest(), 16) % shard_count:02d}.json"
+                shards.setdefault(shard, []).append({
+                    "slug": slug,
+                    "name": product['name'],
+                    "url": page_paths[product['name']],
+                    "category": product.get('category', ''),
+                    "price": self._format_price(product.get('price_range', ''), variant),
+                    "rating": self._aggregate_rating(review['reviews_data']),
+                    "reviews": review['reviews_count'],
+                    "keywords": product.get('keywords', []),
+                    "updated": today
+                })
+            
+            for shard, entries in shards.items():
+                shard_path = os.path.join(site_root, settings.get('dir', 'search-index'), shard)
+                index = {}
+                if os.path.exists(shard_path):
+                    with open(shard_path, 'r', encoding='utf-8') as f:
+                        index = json.load(f)
+                for entry in entries:
+                    index[entry.pop('slug')] = entry
+                self.output_writer.write(shard_path, json.dumps(index, indent=2, sort_keys=True))
+            
+            index_dir = os.path.join(site_root, settings.get('dir', 'search-index'))
+            if os.path.isdir(index_dir):
+                shard_files = sorted(name for name in os.listdir(index_dir)
+                                     if name.startswith('shard-') and name.endswith('.json'))
+                self.output_writer.write(os.path.join(index_dir, 'manifest.json'),
+                                         json.dumps({"shards": shard_files}, indent=2))
+        
+        logger.info(f"🗺️ Updated sitemap and search index for {len(new_reviews)} reviews")
+    
+    def _update_sitemap(self, site_root: str, site_url: str, updated_paths: List[str], lastmod: str):
+        """
+        Refresh sitemap.xml for a site tree.
+        
+        Every page in the configured directories is listed (dated by its
+        file's modification time unless already present); the given pages
+        are stamped with lastmod, and entries for deleted pages are dropped.
+        """
+        namespace = "http://www.sitemaps.org/schemas/sitemap/0.9"
+        sitemap_path = os.path.join(site_root, 'sitemap.xml')
+        settings = self.config.get('sitemap', {})
+        exclude = set(settings.get('exclude', []))
+        
+        def page_url(path: str) -> str:
+            return site_url if path == 'index.html' else urljoin(site_url, path)
+        
+        pages = {}
+        for directory in settings.get('include', ["", "reviews", "categories", "comparisons"]):
+            full_directory = os.path.join(site_root, directory)
+            if not os.path.isdir(full_directory):
+                continue
+            for name in sorted(os.listdir(full_directory)):
+                path = f"{directory}/{name}" if directory else name
+                if name.endswith('.html') and path not in exclude:
+                    pages[page_url(path)] = path
+        
+        entries = {}
+        if os.path.exists(sitemap_path):
+            for url_element in ElementTree.parse(sitemap_path).getroot().findall(f"{{{namespace}}}url"):
+                loc = url_element.findtext(f"{{{namespace}}}loc")
+                # Drop entries for pages of this site that no longer exist
+                if loc and (loc in pages or not loc.startswith(site_url)):
+                    entries[loc] = url_element.findtext(f"{{{namespace}}}lastmod")
+        for loc, path in pages.items():
+            if not entries.get(loc):
+                modified = os.path.getmtime(os.path.join(site_root, path))
+                entries[loc] = datetime.fromtimestamp(modified).strftime('%Y-%m-%d')
+        for path in updated_paths:
+            entries[page_url(path)] = lastmod
+        
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<urlset xmlns="{namespace}">']
+        for loc, modified in sorted(entries.items()):
+            lines.append("  <url>")
+            lines.append(f"    <loc>{html_escape(loc)}</loc>")
+            if modified:
+                lines.append(f"    <lastmod>{modified}</lastmod>")
+            lines.append("  </url>")
+        lines.append("</urlset>")
+        self.output_writer.write(sitemap_path, "\n".join(lines) + "\n")
+    
+    # Generated cards live between these markers inside a page's card grid
+    CARD_BLOCK_START = "<!-- generated-reviews -->"
+    CARD_BLOCK_END = "<!-- /generated-reviews -->"
+    HOMEPAGE_GRID_RE = re.compile(r'<div class="reviews-grid"[^>]*>')
+    CATEGORY_GRID_RE = re.compile(r'<div class="(?:products|reviews)-grid"[^>]*>')
+    CARD_RE = re.compile(r'<!-- review:(?P<slug>[a-z0-9-]+) -->.*?<!-- /review:(?P=slug) -->', re.DOTALL)
+    
+    def update_homepage(self, new_reviews: List[Dict[str, Any]], variants: Optional[List[Dict[str, Any]]] = None):
+        """Insert or refresh review cards for newly published reviews on each variant's homepage."""
         logger.info("🏠 Updating homepage with new reviews...")
+        max_cards = self.config.get('homepage', {}).get('max_cards', 6)
+        for variant in variants or self._variants():
+            homepage = os.path.join(variant['site_root'], 'index.html')
+            cards = [(self._slugify(review['product']['name']), self._review_card(review, variant, ""))
+                     for review in new_reviews]
+            if self._update_card_grid(homepage, self.HOMEPAGE_GRID_RE, cards, max_cards):
+                for review in new_reviews:
+                    logger.info(f"➕ Added {review['product']['name']} to {homepage}")
+    
+    def update_category_pages(self, new_reviews: List[Dict[str, Any]], variants: Optional[List[Dict[str, Any]]] = None):
+        """Insert or refresh review cards on the category page of each newly published review."""
+        for variant in variants or self._variants():
+            by_page: Dict[str, List[tuple]] = {}
+            for review in new_reviews:
+                page = self._category_page(review['product'].get('category', ''), variant['site_root'])
+                if page is None:
+                    logger.info(f"ℹ️ No category page for {review['product'].get('category', '')!r}")
+                    continue
+                card = self._review_card(review, variant, "../")
+                by_page.setdefault(page, []).append((self._slugify(review['product']['name']), card))
+            for page, cards in by_page.items():
+                if self._update_card_grid(page, self.CATEGORY_GRID_RE, cards):
+                    logger.info(f"🗂️ Updated {len(cards)} review cards on {page}")
+    
+    def _category_page(self, category: str, site_root: str) -> Optional[str]:
+        """Category page for a product category: configured mapping first, then a matching categories/*.html."""
+        categories_dir = os.path.join(site_root, 'categories')
+        mapped = self.config.get('category_pages', {}).get(category)
+        if mapped:
+            return os.path.join(categories_dir, f"{mapped}.html")
+        if not os.path.isdir(categories_dir):
+            return None
+        tokens = re.findall(r'[a-z0-9]+', category.lower())
+        candidates = {''.join(tokens)} | set(tokens)
+        for filename in sorted(os.listdir(categories_dir)):
+            name, ext = os.path.splitext(filename)
+            if ext == '.html' and name in candidates:
+                return os.path.join(categories_dir, filename)
+        return None
+    
+    def _review_card(self, review: Dict[str, Any], variant: Dict[str, Any], asset_prefix: str) -> str:
+        """Card linking to a published review, as shown on the homepage and category pages."""
+        product = review['product']
+        slug = self._slugify(product['name'])
+        rating = self._aggregate_rating(review['reviews_data'])
+        rating_html = f'\n            <span class="score">{rating:.1f}/5.0</span>' if rating is not None else ''
+        return f"""<!-- review:{slug} -->
+<div class="review-card glass-card" data-review="{slug}">
+    <div class="review-content">
+        <div class="category-tag">
+            <span>{html_escape(product.get('category', ''))}</span>
+        </div>
+        <h3>{html_escape(product['name'])} Review</h3>
+        <div class="rating">{rating_html}
+            <span class="review-count">({review['reviews_count']}+ reviews)</span>
+        </div>
+        <div class="card-footer">
+            <span class="current-price">{html_escape(self._format_price(product.get('price_range', ''), variant))}</span>
+            <a href="{asset_prefix}reviews/{slug}-review.html" class="review-link">
+                <span>Read Full Review</span>
+                <i class="fas fa-arrow-right"></i>
+            </a>
+        </div>
+    </div>
+</div>
+<!-- /review:{slug} -->"""
+    
+    DIV_TAG_RE = re.compile(r'<(/?)div\b[^>]*>')
+    
+    def _div_children(self, page: str, start: int) -> tuple:
+        """Spans of the top-level <div> children after an opening <div> tag ending at start, and where it closes."""
+        children = []
+        depth = 0
+        for tag in self.DIV_TAG_RE.finditer(page, start):
+            if not tag.group(1):
+                if depth == 0:
+                    child_start = tag.start()
+                depth += 1
+            elif depth == 0:
+                return children, tag.start()
+            else:
+                depth -= 1
+                if depth == 0:
+                    children.append((child_start, tag.end()))
+        return children, len(page)
+    
+    @staticmethod
+    def _removal_start(page: str, start: int) -> int:
+        """Widen a card's span to its own lines, plus a lone comment line labelling it."""
+        start = page.rfind('\n', 0, start)
+        previous = page.rfind('\n', 0, start)
+        line = page[previous + 1:start].strip()
+        if line.startswith('<!--') and line.endswith('-->') and line.count('<!--') == 1:
+            start = previous
+        # Blank lines before the card go with it; the next card keeps its own
+        while start > 0 and not page[page.rfind('\n', 0, start) + 1:start].strip():
+            start = page.rfind('\n', 0, start)
+        return start
+    
+    def _update_card_grid(self, page_path: str, grid_re, cards: List[tuple],
+                          limit: Optional[int] = None) -> bool:
+        """
+        Merge (slug, card) pairs into the generated card block of a page's grid.
+        
+        The block is created inside the first grid opening tag matching grid_re.
+        New cards go first, replacing any earlier card for the same product,
+        whether generated or hand-written. With a limit, the grid keeps that
+        many cards in total: the last hand-written cards go first, then the
+        oldest generated ones.
+        """
+        if not os.path.exists(page_path):
+            logger.warning(f"⚠️ {page_path} not found - skipping review cards")
+            return False
+        with open(page_path, 'r', encoding='utf-8') as f:
+            page = f.read()
         
-        # This would update the index.html file with new review cards
-        # For now, just log the action
-        for review in new_reviews:
-            logger.info(f"➕ Added {review['product']['name']} to homepage")
+        grid_match = grid_re.search(page)
+        if grid_match is None:
+            logger.warning(f"⚠️ No card grid in {page_path} - skipping review cards")
+            return False
+        grid = grid_match.start()
+        # Cards are indented one level deeper than the grid
+        indent = ' ' * (grid - page.rfind('\n', 0, grid) - 1 + 4)
+        children, grid_end = self._div_children(page, grid_match.end())
+        
+        start = page.find(self.CARD_BLOCK_START, grid_match.end(), grid_end)
+        end = page.find(self.CARD_BLOCK_END, start, grid_end) if start != -1 else -1
+        existing = {}
+        if start == -1 or end == -1:
+            start = end = grid_match.end()
+        else:
+            for match in self.CARD_RE.finditer(page, start, end):
+                lines = match.group(0).split('\n')
+                existing[match.group('slug')] = '\n'.join(
+                    [lines[0]] + [line[len(indent):] if line.startswith(indent) else line for line in lines[1:]])
+            end += len(self.CARD_BLOCK_END)
+            # The block is rewritten from the end of the line before its start marker
+            start = page.rfind('\n', 0, start)
+        
+        # Hand-written cards: any grid child outside the generated block
+        merged = dict(cards)
+        handwritten = []
+        removed = []
+        for child_start, child_end in children:
+            if start <= child_start < end:
+                continue
+            card_html = page[child_start:child_end]
+            if any(re.search(rf'href="(?:[^"]*/)?reviews/{re.escape(slug)}-review\.html"', card_html) for slug in merged):
+                removed.append(child_start)
+            else:
+                handwritten.append(child_start)
+        
+        merged.update((slug, card) for slug, card in existing.items() if slug not in merged)
+        ordered = list(merged.values())
+        if limit is not None:
+            excess = max(0, len(ordered) + len(handwritten) - limit)
+            dropped = handwritten[len(handwritten) - min(excess, len(handwritten)):]
+            removed.extend(dropped)
+            ordered = ordered[:len(ordered) - (excess - len(dropped))]
+        
+        lines = [self.CARD_BLOCK_START] + '\n'.join(ordered).split('\n') + [self.CARD_BLOCK_END]
+        block = ''.join(f"\n{indent}{line}" for line in lines)
+        edits = [(start, end, block)]
+        edits += [(self._removal_start(page, child_start), child_end, '')
+                  for child_start, child_end in children if child_start in removed]
+        for edit_start, edit_end, replacement in sorted(edits, reverse=True):
+            page = page[:edit_start] + replacement + page[edit_end:]
+        self.output_writer.write(page_path, page)
+        return True
+    
+    def check_links(self) -> Dict[str, Any]:
+        """
+        Check outbound links and images on the generated pages of every
+        variant site tree, plus relative links to missing files, and write
+        a failure report.
+        
+        Returns:
+            Link check report (also written to link_checker.report_path)
+        """
+        settings = self.config.get('link_checker', {})
+        checker = LinkChecker(
+            cache_path=settings.get('cache_path', 'data/link-cache.json'),
+            ttl_hours=settings.get('cache_ttl_hours', 24),
+            concurrency=settings.get('concurrency', 20),
+            per_host=settings.get('per_host_concurrency', 2),
+            timeout=settings.get('timeout_seconds', 10)
+        )
+        paths = []
+        for variant in self._variants():
+            for path in settings.get('paths', ['index.html', 'reviews', 'categories', 'comparisons']):
+                path = os.path.normpath(os.path.join(variant['site_root'], path))
+                if path not in paths:
+                    paths.append(path)
+        pages = checker.collect_pages(paths)
+        report = checker.check_pages(pages)
+        
+        report_path = settings.get('report_path', 'data/link-report.json')
+        OutputWriter.atomic_write(report_path, json.dumps(report, indent=2).encode('utf-8'))
+        
+        summary = report['summary']
+        if summary['broken'] or summary['missing_local']:
+            logger.warning(f"⚠️ {summary['broken']} broken links and {summary['missing_local']} missing local files "
+                           f"across {len(report['failures'])} pages - see {report_path}")
+        else:
+            logger.info(f"✅ All {summary['links']} outbound links OK")
+        return report
 
     def deploy_to_github(self, commit_message: str = None):
         """
@@ -832,6 +3104,197 @@ class ReviewHarvester:
         except Exception as e:
             logger.error(f"❌ Deployment failed: {str(e)}")
 
+    def _publish_reviews(self, collected: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Phases 3-4 for a batch of products: render every variant, apply the
+        word count gate, then write the pages of the products that passed.
+        
+        Returns:
+            Published review entries
+        """
+        variants = self._variants()
+        return [self._write_review(reviews_data, pages, variants)
+                for reviews_data, pages in self._render_reviews(collected, variants)]
+    
+    def _render_reviews(self, collected: List[Dict[str, Any]], variants: List[Dict[str, Any]]) -> List[tuple]:
+        """
+        Phase 3: generate content once for every storefront variant and gate on word count.
+        
+        Products rejected here stop being linkable in the related products
+        index. When that happens the survivors are rendered again, so no
+        "Compare With" block links to a review page that is never written.
+        """
+        min_word_count = self.config.get('quality_thresholds', {}).get('min_word_count', 0)
+        pending = list(collected)
+        while True:
+            rendered = []
+            unlinked = False
+            for reviews_data in pending:
+                product = reviews_data['product']
+                pages = self.generate_review_variants(reviews_data, variants)
+                if reviews_data['word_count'] >= min_word_count:
+                    rendered.append((reviews_data, pages))
+                    continue
+                logger.warning(f"⚠️ Skipping {product['name']}: {reviews_data['word_count']} words < {min_word_count}")
+                if self.related_index is not None:
+                    unlinked = self.related_index.set_published(product['name'], False) or unlinked
+            if not unlinked:
+                return rendered
+            pending = [reviews_data for reviews_data, _ in rendered]
+    
+    def _write_review(self, reviews_data: Dict[str, Any], pages: Dict[str, str],
+                      variants: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Phase 4: create HTML pages and comparison pages in each variant's site tree."""
+        product = reviews_data['product']
+        filepaths = [
+            self.create_html_page(product['name'], pages[variant['name']], variant['site_root'])
+            for variant in variants
+        ]
+        self.create_comparison_pages(product, variants)
+        if self.related_index is not None:
+            self.related_index.set_published(product['name'], True)
+        
+        return {
+            'product': product,
+            'filepath': filepaths[0],
+            'reviews_count': reviews_data['total_reviews'],
+            'reviews_data': reviews_data
+        }
+    
+    def refresh_related_links(self, names: List[str], variants: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+        """
+        Bring the "Compare With" links of already published pages up to date.
+        
+        Adding products changes other products' neighbour lists (see
+        RelatedProductsIndex.add). Rather than collecting and rendering
+        those products again, only the related products block of each of
+        their published pages is replaced, and any comparison pages it now
+        links to are written.
+        
+        Args:
+            names: Products whose neighbour lists changed
+            variants: Variants to update (defaults to all configured variants)
+            
+        Returns:
+            Paths of the pages that were rewritten
+        """
+        if self.related_index is None or not names:
+            return []
+        entries = {p['name']: p for p in self.related_index.products}
+        variants = variants or self._variants()
+        refreshed = []
+        
+        for name in sorted(set(names)):
+            entry = entries.get(name)
+            if entry is None or entry.get('published') is not True:
+                continue
+            block = self._related_block(entry)
+            for variant in variants:
+                filepath = os.path.normpath(os.path.join(
+                    variant['site_root'], 'reviews', self._slugify(name) + '-review.html'
+                ))
+                if not os.path.exists(filepath):
+                    continue
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    page = f.read()
+                start = page.find(self.RELATED_BLOCK_START)
+                end = page.find(self.RELATED_BLOCK_END, start)
+                if start == -1 or end == -1:
+                    logger.info(f"ℹ️ {filepath} predates related link refreshes - regenerate it to update its links")
+                    continue
+                page = page[:start] + self._fill_slots(block, entry, variant) + page[end + len(self.RELATED_BLOCK_END):]
+                if self.output_writer.write(filepath, page):
+                    logger.info(f"🔁 Refreshed related links: {filepath}")
+                    refreshed.append(filepath)
+            self.create_comparison_pages(entry, variants)
+        
+        return refreshed
+    
+    def resolve_product(self, product_name: str, asin: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Look a product up directly by name, without trend discovery.
+        
+        Checks the related products catalog from earlier runs, then makes a
+        single product lookup, and finally falls back to a minimal product
+        record. A record without an ASIN or Amazon URL is collected but
+        never published; pass asin to supply one.
+        """
+        wanted = product_name.strip().lower()
+        product = None
+        
+        if self.related_index is not None:
+            for entry in self.related_index.products:
+                if entry['name'].lower() == wanted:
+                    product = {k: v for k, v in entry.items() if k not in ('features', 'total_reviews', 'published')}
+                    break
+        
+        if product is None:
+            product = self._simulate_product_lookup(product_name)
+        
+        if product is None:
+            logger.warning(f"⚠️ {product_name} not found in catalog - using a minimal product record")
+            product = {
+                "name": product_name.strip(),
+                "category": "Product",
+                "keywords": [f"{product_name.strip()} review"]
+            }
+        
+        if asin:
+            product['asin'] = asin
+        return product
+    
+    def run_single_product(self, product_name: str, asin: Optional[str] = None):
+        """
+        Refresh one product end to end: collect, render its pages and update
+        the homepage and category cards, sitemap and search index entries
+        that depend on it.
+        
+        Args:
+            product_name: Name of the product to refresh
+            asin: Amazon ASIN for products missing from the catalog
+        """
+        logger.info(f"🎯 Refreshing single product: {product_name}")
+        
+        try:
+            product = self.resolve_product(product_name, asin)
+            
+            # Phase 2: Collect reviews (fresh cached source data is reused)
+            reviews_data = self.collect_reviews(product)
+            
+            quality_failures = self.check_quality(reviews_data)
+            if quality_failures:
+                logger.warning(f"⚠️ Skipping {product['name']}: {'; '.join(quality_failures)}")
+                return None
+            
+            affected = []
+            if self.related_index is not None:
+                affected = self.related_index.upsert(product, reviews_data)
+            self.record_snapshots([reviews_data])
+            
+            published = self._publish_reviews([reviews_data])
+            self.refresh_related_links(affected)
+            # Saved after publishing so the index records whether the page went out
+            if self.related_index is not None:
+                self.related_index.save()
+            if not published:
+                return None
+            published = published[0]
+            
+            # Variant trees get their shared pages before the cards go in
+            self.sync_variant_static_files()
+            self.update_homepage([published])
+            self.update_category_pages([published])
+            self.update_site_indexes([published])
+            self.output_writer.flush()
+            
+            self.deploy_to_github(f"Refresh {product['name']} review")
+            logger.info(f"🎉 Refreshed {product['name']}: {published['filepath']}")
+            return published
+        
+        except Exception as e:
+            logger.error(f"💥 Single product refresh failed: {str(e)}")
+            raise
+    
     def run_full_workflow(self, niche: str, count: int = 3):
         """
         Run the complete automation workflow.
@@ -847,35 +3310,45 @@ class ReviewHarvester:
             trending_products = self.find_trending_products(niche, count)
             logger.info(f"✅ Found {len(trending_products)} trending products")
             
-            new_reviews = []
+            collected = []
+            affected = set()
             
-            # Process each product
+            # Phase 2: Collect reviews for each product
             for product in trending_products:
                 logger.info(f"\n📋 Processing: {product['name']}")
                 
-                # Phase 2: Collect reviews
                 reviews_data = self.collect_reviews(product)
                 
-                # Check if we have enough reviews
-                if reviews_data['total_reviews'] < self.config['min_reviews_per_product']:
-                    logger.warning(f"⚠️ Insufficient reviews ({reviews_data['total_reviews']}) for {product['name']}")
+                # Reject on cheap signals before spending any render time
+                quality_failures = self.check_quality(reviews_data)
+                if quality_failures:
+                    logger.warning(f"⚠️ Skipping {product['name']}: {'; '.join(quality_failures)}")
                     continue
                 
-                # Phase 3: Generate content
-                html_content = self.generate_review_content(reviews_data)
-                
-                # Phase 4: Create HTML page
-                filepath = self.create_html_page(product['name'], html_content)
-                
-                new_reviews.append({
-                    'product': product,
-                    'filepath': filepath,
-                    'reviews_count': reviews_data['total_reviews']
-                })
+                collected.append(reviews_data)
+                if self.related_index is not None:
+                    affected.update(self.related_index.upsert(product, reviews_data))
+            
+            # Archive this run before rendering so trends include it
+            self.record_snapshots(collected)
+            
+            # The whole batch is indexed before rendering so pages can cross-link each other;
+            # it is saved afterwards so the index records which pages went out
+            new_reviews = self._publish_reviews(collected)
+            # Earlier pages whose neighbours changed get their links refreshed; this batch is already current
+            self.refresh_related_links(sorted(affected - {reviews_data['product']['name'] for reviews_data in collected}))
+            if self.related_index is not None and collected:
+                self.related_index.save()
             
             # Update homepage
             if new_reviews:
+                self.sync_variant_static_files()
                 self.update_homepage(new_reviews)
+                self.update_category_pages(new_reviews)
+                self.update_site_indexes(new_reviews)
+                
+                # Make sure every page and its compressed siblings are on disk before deploying
+                self.output_writer.flush()
                 
                 # Phase 5: Deploy to GitHub
                 commit_msg = f"Add {len(new_reviews)} new product reviews for {niche} niche"
@@ -893,24 +3366,32 @@ class ReviewHarvester:
 def main():
     """Main CLI interface."""
     parser = argparse.ArgumentParser(description='AI Review Harvester Automation')
-    parser.add_argument('--niche', required=True, help='Product niche (e.g., electronics, kitchen)')
+    parser.add_argument('--niche', help='Product niche (e.g., electronics, kitchen)')
     parser.add_argument('--count', type=int, default=3, help='Number of products to review')
     parser.add_argument('--product', help='Specific product name to review')
+    parser.add_argument('--asin', help='Amazon ASIN for a --product missing from the catalog')
     parser.add_argument('--config', default='config.json', help='Configuration file path')
     parser.add_argument('--deep-analysis', action='store_true', help='Enable deep analysis mode')
+    parser.add_argument('--check-links', action='store_true', help='Check outbound links on generated pages after the build')
     
     args = parser.parse_args()
+    if not args.niche and not args.product:
+        parser.error('one of --niche or --product is required')
     
     # Initialize harvester
     harvester = ReviewHarvester(args.config)
     
     if args.product:
-        # Single product analysis
-        logger.info(f"🎯 Analyzing specific product: {args.product}")
-        # Implement single product workflow
+        # Single product refresh, skipping trend discovery
+        harvester.run_single_product(args.product, args.asin)
     else:
         # Full niche workflow
         harvester.run_full_workflow(args.niche, args.count)
+    
+    harvester.output_writer.close()
+    
+    if args.check_links:
+        harvester.check_links()
 
 
 if __name__ == "__main__":
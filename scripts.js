@@ -7,6 +7,7 @@
 const $ = (selector) => document.querySelector(selector);
 const $$ = (selector) => document.querySelectorAll(selector);
 
+// ===== INITIALIZATION =====
 // Wait for DOM to be fully loaded
 document.addEventListener('DOMContentLoaded', function() {
     try {
@@ -512,6 +513,48 @@ function initializeSearchSystem() {
         }
     ];
     
+    // Reviews published by the pipeline live in search-index/ shards (see search-index/manifest.json)
+    // and are merged in on first search; hand-written entries above win for the same page
+    let searchIndexLoaded = null;
+    
+    function loadSearchIndex() {
+        if (!searchIndexLoaded) {
+            const base = 'search-index/';
+            const fetchJson = path => fetch(base + path)
+                .then(response => response.ok ? response.json() : null)
+                .catch(() => null);
+            
+            searchIndexLoaded = fetchJson('manifest.json')
+                .then(manifest => Promise.all(((manifest && manifest.shards) || []).map(fetchJson)))
+                .then(shards => {
+                    const knownUrls = new Set(searchDatabase.map(item => item.url));
+                    shards.forEach(shard => {
+                        Object.entries(shard || {}).forEach(([slug, entry]) => {
+                            if (knownUrls.has(entry.url)) return;
+                            knownUrls.add(entry.url);
+                            const rating = entry.rating ? ` · ${entry.rating}/5 from ${entry.reviews}+ reviews` : '';
+                            searchDatabase.push({
+                                id: slug,
+                                title: escapeSearchText(`${entry.name} Review`),
+                                description: escapeSearchText(`${entry.category} · ${entry.price}${rating}`),
+                                category: entry.category,
+                                url: entry.url,
+                                icon: 'fas fa-star',
+                                keywords: [entry.name, entry.category].concat(entry.keywords || [])
+                                    .join(' ').toLowerCase().split(/\s+/).filter(Boolean)
+                            });
+                        });
+                    });
+                })
+                .catch(error => console.warn('Search index unavailable:', error));
+        }
+        return searchIndexLoaded;
+    }
+    
+    function escapeSearchText(text) {
+        return String(text).replace(/[&<>"']/g, char => `&#${char.charCodeAt(0)};`);
+    }
+    
     let searchTimeout;
     let currentQuery = '';
     
@@ -593,16 +636,21 @@ function initializeSearchSystem() {
     });
     
     function performSearch(query) {
-        const results = searchDatabase.filter(item => {
-            const searchTerms = query.toLowerCase().split(' ');
-            return searchTerms.some(term => 
-                item.title.toLowerCase().includes(term) ||
-                item.description.toLowerCase().includes(term) ||
-                item.keywords.some(keyword => keyword.includes(term))
-            );
+        loadSearchIndex().then(() => {
+            // A newer query may have started while the index was loading
+            if (query !== currentQuery && query !== searchInput.value.trim()) return;
+            
+            const results = searchDatabase.filter(item => {
+                const searchTerms = query.toLowerCase().split(' ');
+                return searchTerms.some(term => 
+                    item.title.toLowerCase().includes(term) ||
+                    item.description.toLowerCase().includes(term) ||
+                    item.keywords.some(keyword => keyword.includes(term))
+                );
+            });
+            
+            displaySearchResults(results, query);
         });
-        
-        displaySearchResults(results, query);
     }
     
     function displaySearchResults(results, query) {
@@ -0,0 +1,129 @@
+"""LinkChecker against a local HTTP stand-in."""
+
+import os
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+from automation import LinkChecker  # noqa: E402
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    requests = Counter()
+
+    def _respond(self):
+        type(self).requests[(self.command, self.path)] += 1
+        if self.path == "/ok":
+            self.send_response(200)
+        elif self.path == "/redirect":
+            self.send_response(301)
+            self.send_header("Location", "/ok")
+        elif self.path == "/loop":
+            self.send_response(302)
+            self.send_header("Location", "/loop")
+        elif self.path == "/no-head" and self.command == "HEAD":
+            self.send_response(405)
+        elif self.path == "/no-head":
+            self.send_response(200)
+        elif self.path == "/slow":
+            time.sleep(1)
+            self.send_response(200)
+        else:
+            self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._respond()
+
+    def do_GET(self):
+        self._respond()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _StandIn.requests.clear()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _checker(tmp_path, **kwargs):
+    kwargs.setdefault("timeout", 0.3)
+    return LinkChecker(cache_path=str(tmp_path / "link-cache.json"), **kwargs)
+
+
+def test_statuses(tmp_path, server, closed_port):
+    pages = {
+        "good.html": {f"{server}/ok", f"{server}/redirect", f"{server}/no-head"},
+        "bad.html": {f"{server}/missing", f"{server}/loop", f"{server}/slow",
+                     f"http://127.0.0.1:{closed_port}/"},
+    }
+    report = _checker(tmp_path).check_pages(pages)
+
+    assert report["summary"] == {"pages": 2, "links": 7, "checked": 7, "broken": 4, "missing_local": 0}
+    assert "good.html" not in report["failures"]
+    broken = {entry["url"]: entry for entry in report["failures"]["bad.html"]}
+    assert broken[f"{server}/missing"]["status"] == 404
+    assert broken[f"{server}/loop"]["error"] == "too many redirects"
+    assert broken[f"{server}/slow"]["error"] == "timeout"
+    assert broken[f"http://127.0.0.1:{closed_port}/"]["status"] is None
+    assert _StandIn.requests[("GET", "/no-head")] == 1
+
+
+def test_cache_skips_healthy_links_and_rechecks_failures(tmp_path, server):
+    pages = {"page.html": {f"{server}/ok", f"{server}/missing"}}
+    _checker(tmp_path).check_pages(pages)
+
+    # A fresh checker reads the cache written to disk by the first one
+    report = _checker(tmp_path).check_pages(pages)
+    assert report["summary"]["checked"] == 1
+    assert _StandIn.requests[("HEAD", "/ok")] == 1
+    assert _StandIn.requests[("HEAD", "/missing")] == 2
+
+
+def test_expired_cache_entries_are_rechecked(tmp_path, server):
+    pages = {"page.html": {f"{server}/ok"}}
+    _checker(tmp_path, ttl_hours=0).check_pages(pages)
+    report = _checker(tmp_path, ttl_hours=0).check_pages(pages)
+    assert report["summary"]["checked"] == 1
+    assert _StandIn.requests[("HEAD", "/ok")] == 2
+
+
+def test_missing_local_files_are_reported(tmp_path):
+    site = tmp_path / "site"
+    (site / "reviews").mkdir(parents=True)
+    (site / "index.html").write_text('<a href="reviews/a-review.html#top">A</a>')
+    (site / "reviews" / "a-review.html").write_text(
+        '<a href="../index.html">Home</a> <a href="../comparison.html">Compare</a>'
+        ' <img src="../img/a.png"> <a href="#faq">FAQ</a> <a href="mailto:x@example.com">Mail</a>'
+    )
+    checker = _checker(tmp_path)
+    pages = checker.collect_pages([str(site / "index.html"), str(site / "reviews")])
+    report = checker.check_pages(pages)
+
+    assert report["summary"]["missing_local"] == 2
+    assert str(site / "index.html") not in report["failures"]
+    missing = report["failures"][str(site / "reviews" / "a-review.html")]
+    assert [entry["url"] for entry in missing] == ["../comparison.html", "../img/a.png"]
+    assert all(entry["error"] == "missing file" for entry in missing)
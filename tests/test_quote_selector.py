@@ -0,0 +1,42 @@
+"""QuoteSelector heaps must match a brute-force ranking, including dedupe keys."""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+from automation import QuoteSelector  # noqa: E402
+
+
+def _expected(offers, limit):
+    """Best copy per key (earliest wins ties), then the top `limit` by score."""
+    best = {}
+    for position, (key, score) in offers:
+        if key not in best or score > best[key][0]:
+            best[key] = (score, position)
+    ranked = sorted(best.values(), key=lambda entry: (entry[0], -entry[1]), reverse=True)
+    return [position for _, position in ranked[:limit]]
+
+
+def test_matches_brute_force_ranking():
+    for seed in range(500):
+        rng = random.Random(seed)
+        selector = QuoteSelector(top_n=rng.randint(1, 4), per_source=rng.randint(1, 3))
+        offers = [(rng.choice("abc"), rng.choice("wxyz"), round(rng.random(), 2)) for _ in range(rng.randint(1, 15))]
+        for position, (source, key, score) in enumerate(offers):
+            selector.add(source, {"position": position}, score, key=key)
+
+        overall = [(position, (key, score)) for position, (_, key, score) in enumerate(offers)]
+        assert [q["position"] for q in selector.top_quotes()] == _expected(overall, selector.top_n)
+        by_source = selector.quotes_by_source()
+        for source in "abc":
+            offered = [(position, (key, score)) for position, (s, key, score) in enumerate(offers) if s == source]
+            assert [q["position"] for q in by_source.get(source, [])] == _expected(offered, selector.per_source)
+
+
+def test_later_better_copy_replaces_first_collected():
+    selector = QuoteSelector(top_n=2, per_source=2)
+    selector.add("amazon", {"text": "same", "source": "amazon"}, 0.2, key="k")
+    selector.add("reddit", {"text": "other", "source": "reddit"}, 0.5, key="o")
+    selector.add("reddit", {"text": "same", "source": "reddit"}, 0.9, key="k")
+    assert [(q["text"], q["source"]) for q in selector.top_quotes()] == [("same", "reddit"), ("other", "reddit")]
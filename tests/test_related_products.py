@@ -0,0 +1,77 @@
+"""Incremental RelatedProductsIndex updates must match a full rebuild."""
+
+import copy
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+from automation import RelatedProductsIndex  # noqa: E402
+
+
+def _entry(name):
+    return {"name": name, "category": "", "price_range": "", "amazon_url": "",
+            "keywords": [], "total_reviews": 0, "features": {}}
+
+
+def _unit(vector):
+    return (vector / np.linalg.norm(vector)).astype(np.float32)
+
+
+def _assert_matches_rebuild(index):
+    rebuilt = copy.deepcopy(index)
+    rebuilt.rebuild()
+    np.testing.assert_allclose(index.neighbour_scores, rebuilt.neighbour_scores, atol=1e-5)
+    # Random float vectors don't tie, so the ids must match exactly too
+    np.testing.assert_array_equal(index.neighbour_ids, rebuilt.neighbour_ids)
+
+
+@pytest.fixture
+def index(tmp_path):
+    rng = np.random.default_rng(0)
+    index = RelatedProductsIndex(index_path=str(tmp_path / "related"), neighbours=5)
+    # A few clusters so neighbour lists are dominated by a small set of products
+    centres = rng.normal(size=(10, RelatedProductsIndex.DIMENSIONS))
+    for start in range(0, 300, 50):
+        index.add([(_entry(f"p{i}"), _unit(centres[i % 10] + rng.normal(scale=0.3, size=centres.shape[1])))
+                   for i in range(start, start + 50)])
+    return index
+
+
+def test_batched_adds_match_rebuild(index):
+    _assert_matches_rebuild(index)
+
+
+def test_upsert_dissimilar_product_leaves_old_neighbour_lists(index):
+    rng = np.random.default_rng(1)
+    index.add([(_entry("p0"), _unit(rng.normal(size=RelatedProductsIndex.DIMENSIONS)))])
+    _assert_matches_rebuild(index)
+
+
+def test_upsert_mixed_new_and_existing(index):
+    rng = np.random.default_rng(2)
+    entries = [(_entry(f"p{i}"), _unit(rng.normal(size=RelatedProductsIndex.DIMENSIONS))) for i in range(0, 40, 4)]
+    entries += [(_entry(f"new{i}"), _unit(rng.normal(size=RelatedProductsIndex.DIMENSIONS))) for i in range(10)]
+    index.add(entries)
+    _assert_matches_rebuild(index)
+
+
+def test_add_reports_rows_whose_neighbours_changed(index):
+    before = index.neighbour_ids.copy()
+
+    # A near copy of p0 lands in its cluster's neighbour lists
+    affected = index.add([(_entry("near-p0"), index.vectors[0].copy())])
+
+    after = index.neighbour_ids[:len(before)]
+    expected = {index.products[row]["name"] for row in np.flatnonzero((after != before).any(axis=1))}
+    assert expected and set(affected) == expected
+    assert "near-p0" not in affected
+
+    # Replacing p0 flags every row that lists it, even where the ids stay put
+    listing_p0 = {index.products[row]["name"] for row in np.flatnonzero((index.neighbour_ids == 0).any(axis=1))}
+    affected = index.add([(_entry("p0"), index.vectors[0].copy())])
+    assert listing_p0 <= set(affected)
+    assert "p0" not in affected